@@ -1,7 +1,7 @@
 import jwt
 from django.conf import settings
 from rest_framework import authentication, exceptions
-from users.models import CustomUser as User
+from users.selectors import get_user_by_id
 
 
 class JWTAuthentication(authentication.BaseAuthentication):
@@ -19,13 +19,16 @@ class JWTAuthentication(authentication.BaseAuthentication):
             if payload.get("type") != "access":
                 raise exceptions.AuthenticationFailed("Token is not an access token")
 
-            user = User.objects.get(id=payload["id"])
+            user = get_user_by_id(payload["id"])
 
         except jwt.ExpiredSignatureError:
             raise exceptions.AuthenticationFailed("Token has expired")
         except jwt.DecodeError:
             raise exceptions.AuthenticationFailed("Invalid token")
-        except User.DoesNotExist:
+
+        if user is None:
             raise exceptions.AuthenticationFailed("User not found")
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed("User is inactive")
 
         return (user, payload)
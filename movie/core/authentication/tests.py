@@ -1,3 +1,47 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from core.base.querycount import QueryBudgetTestMixin
+from users.models import CustomUser
+
+
+class AuthenticationEndpointQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(
+            email="viewer@example.com", username="viewer", password="password123"
+        )
+
+    def test_signup(self):
+        response = self.assertQueryBudget(
+            "post",
+            reverse("signup"),
+            {
+                "email": "new@example.com",
+                "username": "new",
+                "password": "password123",
+                "confirm_password": "password123",
+            },
+        )
+        self.assertEqual(response.status_code, 201)
+
+    def test_login(self):
+        response = self.assertQueryBudget(
+            "post",
+            reverse("login"),
+            {"email": "viewer@example.com", "password": "password123"},
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_change_password(self):
+        response = self.assertQueryBudget(
+            "post",
+            reverse("change-password"),
+            {
+                "email": "viewer@example.com",
+                "old_password": "password123",
+                "new_password": "password456",
+                "confirm_password": "password456",
+            },
+        )
+        self.assertEqual(response.status_code, 200)
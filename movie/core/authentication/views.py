@@ -3,14 +3,20 @@ from rest_framework.views import APIView
 from authentication.services import Services
 
 class RegisterView(APIView):
+    query_budget = 2
+
     def post(self, request):
         return Services().register(request)
 
 class LoginView(APIView):
+    query_budget = 1
+
     def post(self, request):
         return Services().login(request)
 
 class ChangePasswordView(APIView):
+    query_budget = 2
+
     def post(self, request):
         response = Services().change_pw(payload=request.data)
         return response
@@ -1,3 +1,10 @@
 from django.contrib import admin
-
+from cinematch.models import GenreStats, InteractionEvent, Movie, MovieAssociation, MovieStats, Rating, UserActivity
 # Register your models here.
+admin.site.register(Movie)
+admin.site.register(Rating)
+admin.site.register(MovieAssociation)
+admin.site.register(InteractionEvent)
+admin.site.register(MovieStats)
+admin.site.register(GenreStats)
+admin.site.register(UserActivity)
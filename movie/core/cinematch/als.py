@@ -0,0 +1,305 @@
+# cinematch/als.py
+"""Alternating least squares matrix factorisation, parallel across cores."""
+
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from multiprocessing import shared_memory
+from pathlib import Path
+from typing import Optional
+
+import numpy as np
+
+from cinematch.artifacts import save_npz
+
+# Worker-side views onto the shared arrays, set by _attach().
+_arrays: dict[str, np.ndarray] = {}
+_segments: list[shared_memory.SharedMemory] = []
+
+
+@dataclass
+class Ratings:
+    """Ratings in coordinate form, with row/column indices into the id lists."""
+    users: np.ndarray   # int32
+    items: np.ndarray   # int32
+    values: np.ndarray  # float32
+    n_users: int
+    n_items: int
+
+    def __len__(self):
+        return len(self.values)
+
+    def split(self, fraction: float, seed: int = 0) -> tuple["Ratings", "Ratings"]:
+        mask = np.random.default_rng(seed).random(len(self)) < fraction
+        return self._subset(~mask), self._subset(mask)
+
+    def _subset(self, mask: np.ndarray) -> "Ratings":
+        return Ratings(self.users[mask], self.items[mask], self.values[mask], self.n_users, self.n_items)
+
+
+@dataclass
+class ALSModel:
+    user_factors: np.ndarray
+    item_factors: np.ndarray
+    mean: float
+    history: list[dict] = field(default_factory=list)
+    user_ids: Optional[np.ndarray] = None
+    movie_ids: Optional[np.ndarray] = None
+
+    def __post_init__(self):
+        users = self.user_ids.tolist() if self.user_ids is not None else []
+        self.user_index = {user_id: i for i, user_id in enumerate(users)}
+
+    def predict(self, users: np.ndarray, items: np.ndarray) -> np.ndarray:
+        return self.mean + np.einsum("ij,ij->i", self.user_factors[users], self.item_factors[items])
+
+    def rmse(self, ratings: Ratings) -> float:
+        if not len(ratings):
+            return float("nan")
+        errors = self.predict(ratings.users, ratings.items) - ratings.values
+        return float(np.sqrt(np.mean(errors ** 2)))
+
+    def recommend(self, user_id: str, limit: int = 10) -> list[tuple[str, float]]:
+        row = self.user_index.get(str(user_id))
+        if row is None:
+            return []
+        scores = self.mean + self.item_factors @ self.user_factors[row]
+        top = np.argpartition(-scores, min(limit, len(scores) - 1))[:limit]
+        top = top[np.argsort(-scores[top])]
+        return [(str(self.movie_ids[i]), float(scores[i])) for i in top]
+
+    def save(self, path: Path) -> None:
+        save_npz(
+            path,
+            user_factors=self.user_factors.astype(np.float32),
+            item_factors=self.item_factors.astype(np.float32),
+            mean=np.float64(self.mean),
+            user_ids=self.user_ids,
+            movie_ids=self.movie_ids,
+        )
+
+    @classmethod
+    def load(cls, path: Path) -> "ALSModel":
+        with np.load(path) as arrays:
+            return cls(
+                user_factors=arrays["user_factors"],
+                item_factors=arrays["item_factors"],
+                mean=float(arrays["mean"]),
+                user_ids=arrays["user_ids"],
+                movie_ids=arrays["movie_ids"],
+            )
+
+
+def _to_csr(rows: np.ndarray, cols: np.ndarray, values: np.ndarray, n_rows: int):
+    order = np.argsort(rows, kind="stable")
+    indptr = np.zeros(n_rows + 1, dtype=np.int64)
+    np.cumsum(np.bincount(rows, minlength=n_rows), out=indptr[1:])
+    return indptr, cols[order].astype(np.int32), values[order].astype(np.float64)
+
+
+def _solve_rows(indptr, indices, data, fixed, out, start, end, reg):
+    eye = np.eye(fixed.shape[1])
+    for row in range(start, end):
+        lo, hi = indptr[row], indptr[row + 1]
+        if lo == hi:
+            out[row] = 0.0
+            continue
+        y = fixed[indices[lo:hi]]
+        out[row] = np.linalg.solve(y.T @ y + reg * (hi - lo) * eye, y.T @ data[lo:hi])
+
+
+def _attach(descriptors: dict[str, tuple[str, tuple, str]]) -> None:
+    for key, (name, shape, dtype) in descriptors.items():
+        segment = shared_memory.SharedMemory(name=name)
+        _segments.append(segment)
+        _arrays[key] = np.ndarray(shape, dtype=dtype, buffer=segment.buf)
+
+
+def _solve_block(side: str, start: int, end: int, reg: float) -> None:
+    if side == "user":
+        _solve_rows(_arrays["user_indptr"], _arrays["user_indices"], _arrays["user_data"],
+                    _arrays["item_factors"], _arrays["user_factors"], start, end, reg)
+    else:
+        _solve_rows(_arrays["item_indptr"], _arrays["item_indices"], _arrays["item_data"],
+                    _arrays["user_factors"], _arrays["item_factors"], start, end, reg)
+
+
+class SharedArrays:
+    """Named NumPy arrays backed by shared memory, owned by the creating process."""
+
+    def __init__(self):
+        self.arrays: dict[str, np.ndarray] = {}
+        self.descriptors: dict[str, tuple[str, tuple, str]] = {}
+        self._segments: list[shared_memory.SharedMemory] = []
+
+    def put(self, key: str, array: np.ndarray) -> np.ndarray:
+        segment = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+        self._segments.append(segment)
+        shared = np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf)
+        shared[...] = array
+        self.arrays[key] = shared
+        self.descriptors[key] = (segment.name, array.shape, array.dtype.str)
+        return shared
+
+    def close(self) -> None:
+        self.arrays.clear()
+        for segment in self._segments:
+            segment.close()
+            segment.unlink()
+        self._segments.clear()
+
+
+@contextmanager
+def _single_threaded_blas():
+    # Each worker solves its own rows; letting every worker also spin up a
+    # full BLAS thread pool would oversubscribe the cores. Spawned workers
+    # read these when they import NumPy.
+    keys = ("OMP_NUM_THREADS", "OPENBLAS_NUM_THREADS", "MKL_NUM_THREADS")
+    saved = {key: os.environ.get(key) for key in keys}
+    os.environ.update({key: "1" for key in keys})
+    try:
+        yield
+    finally:
+        for key, value in saved.items():
+            if value is None:
+                os.environ.pop(key, None)
+            else:
+                os.environ[key] = value
+
+
+def _blocks(n_rows: int, workers: int) -> list[tuple[int, int]]:
+    # A few blocks per worker keeps the pool busy when rows are uneven.
+    size = max(1, math.ceil(n_rows / (workers * 4)))
+    return [(start, min(start + size, n_rows)) for start in range(0, n_rows, size)]
+
+
+def train_als(
+    train: Ratings,
+    validation: Optional[Ratings] = None,
+    *,
+    factors: int = 32,
+    reg: float = 0.05,
+    iterations: int = 15,
+    patience: int = 2,
+    workers: Optional[int] = None,
+    seed: int = 0,
+    log=None,
+    user_ids: Optional[np.ndarray] = None,
+    movie_ids: Optional[np.ndarray] = None,
+) -> ALSModel:
+    """
+    ALS-WR: each half-iteration solves ``(Y_r^T Y_r + reg * n_r * I) x_r =
+    Y_r^T r_r`` for every row of one side with the other side fixed. Rows
+    are solved in blocks by a process pool working on shared-memory arrays,
+    so only block bounds travel through the pool. Stops once validation
+    RMSE has not improved for ``patience`` iterations, keeping the best
+    factors. ``user_ids``/``movie_ids`` map rows back to ids for
+    ``ALSModel.recommend``.
+    """
+    workers = workers or os.cpu_count() or 1
+    mean = float(train.values.mean()) if len(train) else 0.0
+    centred = train.values.astype(np.float64) - mean
+
+    rng = np.random.default_rng(seed)
+    shared = SharedArrays()
+    try:
+        for prefix, rows, cols, n_rows in (
+            ("user", train.users, train.items, train.n_users),
+            ("item", train.items, train.users, train.n_items),
+        ):
+            indptr, indices, data = _to_csr(rows, cols, centred, n_rows)
+            shared.put(f"{prefix}_indptr", indptr)
+            shared.put(f"{prefix}_indices", indices)
+            shared.put(f"{prefix}_data", data)
+        shared.put("user_factors", np.zeros((train.n_users, factors)))
+        shared.put("item_factors", rng.normal(scale=0.1, size=(train.n_items, factors)))
+
+        user_blocks = _blocks(train.n_users, workers)
+        item_blocks = _blocks(train.n_items, workers)
+        model = ALSModel(shared.arrays["user_factors"], shared.arrays["item_factors"], mean)
+        best, best_rmse, stale = None, math.inf, 0
+
+        with _pool(workers, shared) as run:
+            for iteration in range(1, iterations + 1):
+                started = time.perf_counter()
+                run("user", user_blocks, reg)
+                run("item", item_blocks, reg)
+                entry = {
+                    "iteration": iteration,
+                    "seconds": time.perf_counter() - started,
+                    "train_rmse": model.rmse(train),
+                    "validation_rmse": model.rmse(validation) if validation is not None else None,
+                }
+                model.history.append(entry)
+                if log:
+                    log(entry)
+
+                score = entry["validation_rmse"]
+                if score is None or math.isnan(score):
+                    continue
+                if score < best_rmse:
+                    best_rmse, stale = score, 0
+                    best = (model.user_factors.copy(), model.item_factors.copy())
+                else:
+                    stale += 1
+                    if stale >= patience:
+                        break
+
+        if best is None:
+            best = (model.user_factors.copy(), model.item_factors.copy())
+        return ALSModel(best[0], best[1], mean, model.history, user_ids=user_ids, movie_ids=movie_ids)
+    finally:
+        shared.close()
+
+
+@contextmanager
+def _pool(workers: int, shared: SharedArrays):
+    """Yield ``run(side, blocks, reg)``, solving blocks in-process or in a pool."""
+    if workers <= 1:
+        _arrays.update(shared.arrays)
+        try:
+            yield lambda side, blocks, reg: [_solve_block(side, s, e, reg) for s, e in blocks]
+        finally:
+            _arrays.clear()
+        return
+
+    context = multiprocessing.get_context("spawn")
+    with _single_threaded_blas(), ProcessPoolExecutor(
+        max_workers=workers, mp_context=context, initializer=_attach, initargs=(shared.descriptors,)
+    ) as pool:
+        def run(side, blocks, reg):
+            if not blocks:
+                return
+            # list() waits for the whole half-iteration and re-raises worker errors.
+            list(pool.map(_solve_block, *zip(*[(side, s, e, reg) for s, e in blocks])))
+        yield run
+
+
+def benchmark(ratings: Ratings, cores: list[int], iterations: int = 3, factors: int = 32) -> list[dict]:
+    """Wall time of a fixed number of iterations for each worker count."""
+    results = []
+    for workers in cores:
+        started = time.perf_counter()
+        train_als(ratings, factors=factors, iterations=iterations, patience=iterations, workers=workers)
+        seconds = time.perf_counter() - started
+        results.append({
+            "workers": workers,
+            "seconds": seconds,
+            "speedup": results[0]["seconds"] / seconds if results else 1.0,
+        })
+    return results
+
+
+def als_model_path(model_dir) -> Path:
+    return Path(model_dir) / "als.npz"
+
+
+def load_als_model() -> Optional[ALSModel]:
+    from django.conf import settings
+
+    path = als_model_path(settings.CINEMATCH_MODEL_DIR)
+    return ALSModel.load(path) if path.exists() else None
@@ -4,3 +4,15 @@ from django.apps import AppConfig
 class CinematchConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'cinematch'
+
+    def ready(self):
+        from cinematch.registry import registry
+
+        # Dotted paths only: nothing heavy is imported until first use.
+        registry.register(
+            "transitions",
+            loader="cinematch.transitions.load_transition_model",
+            warmup="cinematch.transitions.warmup_transition_model",
+        )
+        registry.register("bandit", loader="cinematch.bandit.load_bandit_policy")
+        registry.register("als", loader="cinematch.als.load_als_model")
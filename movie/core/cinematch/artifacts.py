@@ -0,0 +1,25 @@
+# cinematch/artifacts.py
+"""Model artifacts written by the build commands and loaded by the workers."""
+
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+
+def save_npz(path: Path, **arrays: np.ndarray) -> None:
+    """
+    Write ``arrays`` to ``path`` via a temporary file in the same directory
+    and ``os.replace``, so a worker loading it mid-rebuild sees either the
+    old or the new artifact, never a truncated one.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as fh:
+            np.savez(fh, **arrays)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
@@ -0,0 +1,167 @@
+# cinematch/associations.py
+"""Co-watch association mining ("people who watched X also watched Y")."""
+
+import heapq
+import multiprocessing
+import os
+import pickle
+import tempfile
+import uuid
+from collections import Counter, defaultdict
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from itertools import islice
+from typing import Iterable, Iterator, Optional
+
+# (associated movie index, co-watch count, confidence, lift)
+Neighbour = tuple[int, int, float, float]
+
+
+def _spill(counts: Counter, spill_dir: str, num_movies: int, num_shards: int) -> list[tuple[int, str]]:
+    shards = defaultdict(dict)
+    for key, count in counts.items():
+        shards[(key // num_movies) % num_shards][key] = count
+
+    paths = []
+    for shard, shard_counts in shards.items():
+        path = os.path.join(spill_dir, f"{shard:05d}-{uuid.uuid4().hex}.pkl")
+        with open(path, "wb") as fh:
+            pickle.dump(shard_counts, fh, protocol=pickle.HIGHEST_PROTOCOL)
+        paths.append((shard, path))
+    return paths
+
+
+def _count_batch(
+    histories: list[list[int]],
+    spill_dir: str,
+    num_movies: int,
+    num_shards: int,
+    max_pairs: int,
+) -> list[tuple[int, str]]:
+    """Count ordered co-watch pairs for a batch of users and spill them to disk."""
+    counts = Counter()
+    paths = []
+    for history in histories:
+        for a in history:
+            base = a * num_movies
+            for b in history:
+                if a != b:
+                    counts[base + b] += 1
+        if len(counts) >= max_pairs:
+            paths.extend(_spill(counts, spill_dir, num_movies, num_shards))
+            counts.clear()
+    if counts:
+        paths.extend(_spill(counts, spill_dir, num_movies, num_shards))
+    return paths
+
+
+def _reduce_shard(
+    paths: list[str],
+    item_counts: list[int],
+    num_users: int,
+    num_movies: int,
+    top_n: int,
+    min_support: int,
+) -> list[tuple[int, list[Neighbour]]]:
+    """Merge one shard's spill files and rank the neighbours of its movies."""
+    counts = Counter()
+    for path in paths:
+        with open(path, "rb") as fh:
+            counts.update(pickle.load(fh))
+        os.remove(path)
+
+    by_movie = defaultdict(list)
+    for key, co_count in counts.items():
+        if co_count < min_support:
+            continue
+        a, b = divmod(key, num_movies)
+        confidence = co_count / item_counts[a]
+        lift = co_count * num_users / (item_counts[a] * item_counts[b])
+        by_movie[a].append((b, co_count, confidence, lift))
+
+    # The movie index breaks ties so the ranking does not depend on the
+    # order spill files arrive in, which differs between pool runs.
+    return [
+        (a, heapq.nlargest(top_n, neighbours, key=lambda n: (n[3], n[1], -n[0])))
+        for a, neighbours in by_movie.items()
+    ]
+
+
+def mine_associations(
+    histories: Iterable[list[int]],
+    num_movies: int,
+    *,
+    top_n: int = 20,
+    min_support: int = 5,
+    workers: Optional[int] = None,
+    num_shards: int = 64,
+    batch_users: int = 2000,
+    max_pairs: int = 2_000_000,
+    max_history: int = 200,
+    spill_dir: Optional[str] = None,
+) -> Iterator[tuple[int, list[Neighbour]]]:
+    """
+    Stream user histories (lists of movie indices in ``range(num_movies)``)
+    and yield ``(movie_index, neighbours)`` with at most ``top_n`` neighbours
+    each, best first. Histories longer than ``max_history`` keep only their
+    most recent items, which bounds the quadratic per-user pair cost.
+
+    Pairs are counted per batch in a process pool and spilled to one file
+    per shard once a worker holds ``max_pairs`` of them; each shard is then
+    reduced on its own, so the full item x item matrix is never in memory.
+    """
+    workers = workers or os.cpu_count() or 1
+    item_counts = [0] * num_movies
+    num_users = 0
+
+    with tempfile.TemporaryDirectory(prefix="cinematch-pairs-", dir=spill_dir) as tmp_dir:
+        shard_paths = defaultdict(list)
+
+        def batches():
+            nonlocal num_users
+            iterator = iter(histories)
+            while True:
+                batch = []
+                for history in islice(iterator, batch_users):
+                    history = list(dict.fromkeys(history[-max_history:]))
+                    for movie in history:
+                        item_counts[movie] += 1
+                    batch.append(history)
+                if not batch:
+                    return
+                num_users += len(batch)
+                yield batch
+
+        if workers <= 1:
+            for batch in batches():
+                for shard, path in _count_batch(batch, tmp_dir, num_movies, num_shards, max_pairs):
+                    shard_paths[shard].append(path)
+            for shard in sorted(shard_paths):
+                yield from _reduce_shard(
+                    shard_paths[shard], item_counts, num_users, num_movies, top_n, min_support
+                )
+            return
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            # Keep a bounded number of batches in flight so the producer
+            # cannot run ahead of the workers and buffer the whole history.
+            pending = set()
+            for batch in batches():
+                pending.add(pool.submit(_count_batch, batch, tmp_dir, num_movies, num_shards, max_pairs))
+                if len(pending) >= workers * 2:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for shard, path in future.result():
+                            shard_paths[shard].append(path)
+            for future in pending:
+                for shard, path in future.result():
+                    shard_paths[shard].append(path)
+
+            reducers = [
+                pool.submit(
+                    _reduce_shard, shard_paths[shard], item_counts, num_users, num_movies, top_n, min_support
+                )
+                for shard in sorted(shard_paths)
+            ]
+            for future in reducers:
+                yield from future.result()
@@ -0,0 +1,217 @@
+# cinematch/bandit.py
+"""Online exploration (Thompson sampling or UCB1) for recommendation rails."""
+
+import logging
+import os
+import time
+import uuid
+from collections import defaultdict
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Optional
+
+import numpy as np
+from django.conf import settings
+from django.core.cache import cache
+
+from cinematch.services import Feedback
+from core.base.choices import FeedbackChoices
+
+logger = logging.getLogger(__name__)
+
+STATS_KEY = "cinematch:bandit:{rail}"
+LOCK_KEY = "cinematch:bandit:{rail}:lock"
+# Decayed impressions + clicks below which an arm is dropped; a single
+# impression gets there after about seven half-lives.
+MIN_ARM_WEIGHT = 0.01
+
+
+@dataclass
+class ArmStats:
+    """Decayed impression and click counts per arm of one rail, cached under ``STATS_KEY``."""
+    arm_ids: list[str] = field(default_factory=list)
+    impressions: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float64))
+    clicks: np.ndarray = field(default_factory=lambda: np.zeros(0, dtype=np.float64))
+    updated_at: float = field(default_factory=time.time)
+
+    def __post_init__(self):
+        self.index = {arm: i for i, arm in enumerate(self.arm_ids)}
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        del state["index"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.__post_init__()
+
+    def lookup(self, arms: list[str]) -> np.ndarray:
+        """Indices of ``arms``, ``-1`` for arms never seen."""
+        return np.fromiter((self.index.get(arm, -1) for arm in arms), dtype=np.int64, count=len(arms))
+
+    def add(self, arms: list[str], clicked: np.ndarray, now: float, half_life: float) -> None:
+        """Decay the counts to ``now``, then add one impression or click per entry of ``arms``."""
+        decay = 0.5 ** (max(now - self.updated_at, 0.0) / half_life)
+        self.impressions *= decay
+        self.clicks *= decay
+        self.updated_at = now
+
+        new = [arm for arm in dict.fromkeys(arms) if arm not in self.index]
+        if new:
+            for arm in new:
+                self.index[arm] = len(self.arm_ids)
+                self.arm_ids.append(arm)
+            self.impressions = np.concatenate([self.impressions, np.zeros(len(new))])
+            self.clicks = np.concatenate([self.clicks, np.zeros(len(new))])
+
+        rows = self.lookup(arms)
+        np.add.at(self.impressions, rows[~clicked], 1.0)
+        np.add.at(self.clicks, rows[clicked], 1.0)
+
+    def prune(self, max_arms: int, min_weight: float = MIN_ARM_WEIGHT) -> None:
+        """
+        Drop arms whose decayed counts fell below ``min_weight``, then keep
+        at most the ``max_arms`` heaviest.
+        """
+        weight = self.impressions + self.clicks
+        keep = weight >= min_weight
+        if keep.sum() > max_arms:
+            keep[np.argsort(-weight, kind="stable")[max_arms:]] = False
+        if keep.all():
+            return
+        self.arm_ids = [arm for arm, kept in zip(self.arm_ids, keep) if kept]
+        self.impressions = self.impressions[keep]
+        self.clicks = self.clicks[keep]
+        self.__post_init__()
+
+
+@contextmanager
+def _rail_lock(rail: str, timeout: float = 5.0):
+    """
+    Yield whether the rail's lock was acquired within ``timeout`` seconds.
+    ``cache.add`` is atomic on the shared backends, which makes it a cheap
+    cross-process mutex for the read-modify-write of a rail's arrays.
+    """
+    key = LOCK_KEY.format(rail=rail)
+    token = uuid.uuid4().hex
+    deadline = time.monotonic() + timeout
+    acquired = cache.add(key, token, timeout)
+    while not acquired and time.monotonic() < deadline:
+        time.sleep(0.005)
+        acquired = cache.add(key, token, timeout)
+    try:
+        yield acquired
+    finally:
+        # The lock expires after ``timeout``; by then another process may
+        # hold it, so only release it if it is still ours.
+        if acquired and cache.get(key) == token:
+            cache.delete(key)
+
+
+class BanditPolicy:
+    def __init__(self, half_life: float, refresh: float, prior_weight: float, max_arms: int):
+        self.half_life = half_life
+        self.refresh = refresh
+        self.prior_weight = prior_weight
+        self.max_arms = max_arms
+        # Per-process copy of each rail's stats, refreshed at most every
+        # ``refresh`` seconds so selection does not unpickle the arrays on
+        # every request.
+        self._local: dict[str, tuple[float, ArmStats]] = {}
+        self._rng: Optional[np.random.Generator] = None
+        self._rng_pid: Optional[int] = None
+
+    @property
+    def rng(self) -> np.random.Generator:
+        # The policy can be preloaded in the gunicorn master; a generator
+        # created there would hand every forked worker the same draws.
+        if self._rng_pid != os.getpid():
+            self._rng = np.random.default_rng()
+            self._rng_pid = os.getpid()
+        return self._rng
+
+    def apply_feedback(self, events: list[Feedback]) -> int:
+        """Fold a batch of feedback into the stats, one locked read-modify-write per rail."""
+        by_rail = defaultdict(list)
+        for event in events:
+            by_rail[event.rail].append(event)
+
+        now = time.time()
+        applied = 0
+        for rail, rail_events in by_rail.items():
+            with _rail_lock(rail) as acquired:
+                if not acquired:
+                    # Proceeding would overwrite the holder's update; the
+                    # counts are statistical, so this batch is skipped.
+                    logger.warning("Skipped %d feedback events: rail %r is locked", len(rail_events), rail)
+                    continue
+                key = STATS_KEY.format(rail=rail)
+                stats = cache.get(key) or ArmStats()
+                stats.add(
+                    [e.movie_id for e in rail_events],
+                    np.array([e.kind == FeedbackChoices.CLICK for e in rail_events], dtype=bool),
+                    now,
+                    self.half_life,
+                )
+                stats.prune(self.max_arms)
+                cache.set(key, stats, None)
+            self._local.pop(rail, None)
+            applied += len(rail_events)
+        return applied
+
+    def get_stats(self, rail: str) -> ArmStats:
+        cached = self._local.get(rail)
+        now = time.monotonic()
+        if cached is None or now - cached[0] > self.refresh:
+            cached = (now, cache.get(STATS_KEY.format(rail=rail)) or ArmStats())
+            self._local[rail] = cached
+        return cached[1]
+
+    def rerank(
+        self,
+        rail: str,
+        candidates: list[str],
+        limit: int,
+        priors: Optional[np.ndarray] = None,
+        policy: str = "thompson",
+    ) -> list[str]:
+        """
+        Return ``limit`` of ``candidates`` ordered by sampled (Thompson) or
+        optimistic (UCB1) click-through. ``priors`` are the ranker's scores
+        scaled to [0, 1]; without them every arm starts at Beta(1, 1).
+        """
+        if not candidates:
+            return []
+
+        stats = self.get_stats(rail)
+        rows = stats.lookup(candidates)
+        seen = rows >= 0
+        impressions = np.zeros(len(candidates))
+        clicks = np.zeros(len(candidates))
+        impressions[seen] = stats.impressions[rows[seen]]
+        clicks[seen] = stats.clicks[rows[seen]]
+
+        prior = np.full(len(candidates), 0.5) if priors is None else np.clip(priors, 0.0, 1.0)
+        alpha = 1.0 + self.prior_weight * prior + clicks
+        beta = 1.0 + self.prior_weight * (1.0 - prior) + np.maximum(impressions - clicks, 0.0)
+
+        if policy == "thompson":
+            scores = self.rng.beta(alpha, beta)
+        elif policy == "ucb":
+            total = max(stats.impressions.sum(), 1.0)
+            scores = alpha / (alpha + beta) + np.sqrt(2.0 * np.log(total + 1.0) / (impressions + 1.0))
+        else:
+            raise ValueError(f"Unknown bandit policy {policy!r}")
+
+        order = np.argsort(-scores, kind="stable")[:limit]
+        return [candidates[i] for i in order]
+
+
+def load_bandit_policy() -> BanditPolicy:
+    return BanditPolicy(
+        half_life=settings.CINEMATCH_BANDIT_HALF_LIFE,
+        refresh=settings.CINEMATCH_BANDIT_REFRESH,
+        prior_weight=settings.CINEMATCH_BANDIT_PRIOR_WEIGHT,
+        max_arms=settings.CINEMATCH_BANDIT_MAX_ARMS,
+    )
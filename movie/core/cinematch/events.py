@@ -0,0 +1,156 @@
+# cinematch/events.py
+"""In-process micro-batching for rating/watch events and rail feedback."""
+
+import atexit
+import logging
+import threading
+from typing import Callable, Optional
+
+from django.conf import settings
+from django.db import close_old_connections
+
+from cinematch.registry import registry
+from cinematch.services import Event, Feedback, apply_events
+from cinematch.sessions import push_recent
+
+logger = logging.getLogger(__name__)
+
+
+class EventBatcher:
+    """
+    Buffers items and hands them to ``apply`` in batches from a background
+    thread. ``apply`` receives a list and returns how many items it applied.
+    Items still buffered when the process dies are lost; with
+    ``interval_ms <= 0`` every item is applied synchronously instead.
+    """
+
+    def __init__(
+        self,
+        interval_ms: int,
+        max_batch: int,
+        apply: Callable[[list], int] = apply_events,
+        name: str = "cinematch-event-batcher",
+    ):
+        self.interval = interval_ms / 1000
+        self.max_batch = max_batch
+        self.apply = apply
+        self.name = name
+        self._buffer: list = []
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record(self, event) -> None:
+        if self.interval <= 0:
+            self.apply([event])
+            return
+
+        with self._lock:
+            self._buffer.append(event)
+            size = len(self._buffer)
+            if self._thread is None:
+                self._start()
+        if size >= self.max_batch:
+            self._wakeup.set()
+
+    def flush(self) -> int:
+        """
+        Apply the buffer in slices of at most ``max_batch``. A slice that
+        fails is retried once; if it fails again it is dropped and the rest
+        of the buffer is left for the next flush.
+        """
+        applied = 0
+        while True:
+            with self._lock:
+                events = self._buffer[:self.max_batch]
+                del self._buffer[:self.max_batch]
+            if not events:
+                return applied
+            try:
+                applied += self._apply_with_retry(events)
+            except Exception:
+                logger.exception("%s dropped a batch of %d events", self.name, len(events))
+                return applied
+
+    def _apply_with_retry(self, events: list) -> int:
+        try:
+            return self.apply(events)
+        except Exception:
+            logger.warning("%s failed to apply %d events, retrying", self.name, len(events), exc_info=True)
+            return self.apply(events)
+
+    def stop(self) -> None:
+        self._stopped.set()
+        self._wakeup.set()
+        if self._thread is not None:
+            self._thread.join()
+        self.flush()
+
+    def _start(self) -> None:
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+        atexit.register(self.stop)
+
+    def _run(self) -> None:
+        while not self._stopped.is_set():
+            self._wakeup.wait(self.interval)
+            self._wakeup.clear()
+            close_old_connections()
+            self.flush()
+        close_old_connections()
+
+
+def _apply_feedback(events: list[Feedback]) -> int:
+    return registry.get("bandit").apply_feedback(events)
+
+
+_batcher: Optional[EventBatcher] = None
+_feedback_batcher: Optional[EventBatcher] = None
+_batcher_lock = threading.Lock()
+
+
+def get_batcher() -> EventBatcher:
+    global _batcher
+    if _batcher is None:
+        with _batcher_lock:
+            if _batcher is None:
+                _batcher = EventBatcher(
+                    interval_ms=settings.CINEMATCH_EVENT_FLUSH_MS,
+                    max_batch=settings.CINEMATCH_EVENT_MAX_BATCH,
+                )
+    return _batcher
+
+
+def get_feedback_batcher() -> EventBatcher:
+    global _feedback_batcher
+    if _feedback_batcher is None:
+        with _batcher_lock:
+            if _feedback_batcher is None:
+                _feedback_batcher = EventBatcher(
+                    interval_ms=settings.CINEMATCH_EVENT_FLUSH_MS,
+                    max_batch=settings.CINEMATCH_EVENT_MAX_BATCH,
+                    apply=_apply_feedback,
+                    name="cinematch-feedback-batcher",
+                )
+    return _feedback_batcher
+
+
+def record_event(user_id, movie_id, event_type: str, score: Optional[int] = None) -> None:
+    # The session buffer is updated immediately so the next page view
+    # already sees this interaction, even before the batch is flushed.
+    push_recent(user_id, movie_id)
+    get_batcher().record(Event(user_id=user_id, movie_id=movie_id, event_type=event_type, score=score))
+
+
+def flush_events() -> int:
+    return get_batcher().flush()
+
+
+def record_feedback(rail: str, movie_id, kind: str) -> None:
+    """Buffer a rail impression/click for the bandit (see ``cinematch.bandit``)."""
+    get_feedback_batcher().record(Feedback(rail=rail, movie_id=str(movie_id), kind=kind))
+
+
+def flush_feedback() -> int:
+    return get_feedback_batcher().flush()
@@ -0,0 +1,82 @@
+import os
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from cinematch.associations import mine_associations
+from cinematch.models import Movie, MovieAssociation, Rating
+
+
+class Command(BaseCommand):
+    help = "Mine co-watch pairs from user histories and store the top-N associations per movie."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top-n", type=int, default=20)
+        parser.add_argument("--min-support", type=int, default=5,
+                            help="Minimum number of shared viewers for a pair to be kept.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+        parser.add_argument("--shards", type=int, default=64)
+        parser.add_argument("--batch-users", type=int, default=2000)
+        parser.add_argument("--max-pairs", type=int, default=2_000_000,
+                            help="Distinct pairs a worker holds in memory before spilling to disk.")
+        parser.add_argument("--max-history", type=int, default=200)
+        parser.add_argument("--spill-dir", default=None)
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        movie_ids = list(Movie.objects.order_by("id").values_list("id", flat=True))
+        index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+        rows = (
+            Rating.objects
+            .order_by("user_id", "created_at")
+            .values_list("user_id", "movie_id")
+            .iterator(chunk_size=options["chunk_size"])
+        )
+        histories = (
+            [index[movie_id] for _, movie_id in group]
+            for _, group in groupby(rows, key=lambda row: row[0])
+        )
+
+        results = mine_associations(
+            histories,
+            len(movie_ids),
+            top_n=options["top_n"],
+            min_support=options["min_support"],
+            workers=options["workers"],
+            num_shards=options["shards"],
+            batch_users=options["batch_users"],
+            max_pairs=options["max_pairs"],
+            max_history=options["max_history"],
+            spill_dir=options["spill_dir"],
+        )
+
+        # Mining streams from the ratings cursor, so it has to finish before
+        # the table swap starts; the swap itself is one transaction so
+        # readers never see a half-written association set.
+        results = list(results)
+        written = 0
+        with transaction.atomic():
+            MovieAssociation.objects.all().delete()
+            batch = []
+            for movie, neighbours in results:
+                for rank, (other, co_count, confidence, lift) in enumerate(neighbours, start=1):
+                    batch.append(MovieAssociation(
+                        movie_id=movie_ids[movie],
+                        associated_movie_id=movie_ids[other],
+                        rank=rank,
+                        co_count=co_count,
+                        confidence=confidence,
+                        lift=lift,
+                    ))
+                if len(batch) >= options["chunk_size"]:
+                    MovieAssociation.objects.bulk_create(batch)
+                    written += len(batch)
+                    batch = []
+            MovieAssociation.objects.bulk_create(batch)
+            written += len(batch)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {written} associations for {len(results)} movies."
+        ))
@@ -0,0 +1,48 @@
+from itertools import groupby
+
+from django.core.management.base import BaseCommand
+
+from cinematch.models import InteractionEvent, Movie
+from cinematch.transitions import TransitionModel, transition_model_path
+
+
+class Command(BaseCommand):
+    help = "Build the item-to-item transition model used for next-movie recommendations."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--window", type=int, default=3,
+                            help="How many following interactions count as a transition.")
+        parser.add_argument("--decay", type=float, default=0.5)
+        parser.add_argument("--top-m", type=int, default=100,
+                            help="Successors kept per movie.")
+        parser.add_argument("--chunk-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        movie_ids = [str(m) for m in Movie.objects.order_by("id").values_list("id", flat=True)]
+        index = {movie_id: i for i, movie_id in enumerate(movie_ids)}
+
+        rows = (
+            InteractionEvent.objects
+            .order_by("user_id", "occurred_at")
+            .values_list("user_id", "movie_id")
+            .iterator(chunk_size=options["chunk_size"])
+        )
+        # A rating right after a watch of the same movie is one interaction.
+        sequences = (
+            [index[str(movie_id)] for movie_id, _ in groupby(movie_id for _, movie_id in group)]
+            for _, group in groupby(rows, key=lambda row: row[0])
+        )
+
+        model = TransitionModel.build(
+            movie_ids,
+            sequences,
+            window=options["window"],
+            decay=options["decay"],
+            top_m=options["top_m"],
+        )
+        path = transition_model_path()
+        model.save(path)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {len(model.data)} transitions for {len(movie_ids)} movies in {path}."
+        ))
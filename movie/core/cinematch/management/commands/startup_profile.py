@@ -0,0 +1,73 @@
+import os
+import re
+import subprocess
+import sys
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cinematch.registry import registry
+
+# What a fresh process does before it can serve a request.
+STARTUP = (
+    "import django; django.setup(); "
+    "from django.urls import get_resolver; get_resolver().url_patterns"
+)
+IMPORT_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)$")
+
+
+class Command(BaseCommand):
+    help = "Report import cost per installed app / package of a fresh Django start-up."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--limit", type=int, default=20, help="Rows to show.")
+        parser.add_argument("--warmup", action="store_true",
+                            help="Also load every registered recommender resource and time it.")
+
+    def handle(self, *args, **options):
+        env = {**os.environ, "DJANGO_SETTINGS_MODULE": os.environ.get("DJANGO_SETTINGS_MODULE", "core.settings")}
+        result = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", STARTUP],
+            cwd=settings.BASE_DIR,
+            env=env,
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            lines = result.stderr.strip().splitlines()
+            raise CommandError(lines[-1] if lines else f"Start-up exited with code {result.returncode}.")
+
+        # Attribute each module's own (self) time to the longest matching
+        # INSTALLED_APPS entry, falling back to its top-level package.
+        apps = sorted(settings.INSTALLED_APPS, key=len, reverse=True)
+        self_us = defaultdict(int)
+        modules = defaultdict(int)
+        total_us = 0
+        for line in result.stderr.splitlines():
+            match = IMPORT_LINE.match(line)
+            if not match:
+                continue
+            own, cumulative, indent, module = match.groups()
+            if len(indent) == 1:
+                total_us += int(cumulative)
+            owner = next(
+                (app for app in apps if module == app or module.startswith(app + ".")),
+                module.split(".")[0],
+            )
+            self_us[owner] += int(own)
+            modules[owner] += 1
+
+        self.stdout.write(f"{'app / package':<40} {'ms':>9} {'share':>7} {'modules':>8}")
+        for owner, us in sorted(self_us.items(), key=lambda item: -item[1])[:options["limit"]]:
+            self.stdout.write(
+                f"{owner:<40} {us / 1000:>9.1f} {us / max(total_us, 1):>7.1%} {modules[owner]:>8}"
+            )
+        self.stdout.write(f"{'total':<40} {total_us / 1000:>9.1f}")
+
+        if options["warmup"]:
+            self.stdout.write("")
+            self.stdout.write(f"{'resource':<40} {'load ms':>9}")
+            for name, seconds in registry.warmup().items():
+                state = "" if registry.is_loaded(name) else "  (not built)"
+                self.stdout.write(f"{name:<40} {seconds * 1000:>9.1f}{state}")
@@ -0,0 +1,78 @@
+import os
+from array import array
+
+import numpy as np
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from cinematch.als import Ratings, als_model_path, benchmark, train_als
+from cinematch.models import Rating
+
+
+class Command(BaseCommand):
+    help = "Train ALS user/movie factors from ratings, in parallel across CPU cores."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--factors", type=int, default=32)
+        parser.add_argument("--reg", type=float, default=0.05)
+        parser.add_argument("--iterations", type=int, default=15)
+        parser.add_argument("--patience", type=int, default=2,
+                            help="Stop after this many iterations without validation improvement.")
+        parser.add_argument("--validation", type=float, default=0.1,
+                            help="Fraction of ratings held out for early stopping.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count())
+        parser.add_argument("--benchmark", default=None, metavar="CORES",
+                            help="Comma-separated worker counts, e.g. 1,2,4,8. Reports wall time "
+                                 "per count instead of saving a model.")
+        parser.add_argument("--chunk-size", type=int, default=20000)
+
+    def handle(self, *args, **options):
+        ratings, user_ids, movie_ids = self.load_ratings(options["chunk_size"])
+        if not len(ratings):
+            raise CommandError("No ratings to train on.")
+        self.stdout.write(f"{len(ratings)} ratings, {ratings.n_users} users, {ratings.n_items} movies")
+
+        if options["benchmark"]:
+            cores = [int(c) for c in options["benchmark"].split(",")]
+            self.stdout.write(f"{'workers':>8} {'seconds':>9} {'speedup':>8}")
+            for row in benchmark(ratings, cores, factors=options["factors"]):
+                self.stdout.write(f"{row['workers']:>8} {row['seconds']:>9.2f} {row['speedup']:>7.2f}x")
+            return
+
+        train, validation = ratings.split(options["validation"])
+        model = train_als(
+            train,
+            validation,
+            factors=options["factors"],
+            reg=options["reg"],
+            iterations=options["iterations"],
+            patience=options["patience"],
+            workers=options["workers"],
+            user_ids=np.asarray(user_ids, dtype=str),
+            movie_ids=np.asarray(movie_ids, dtype=str),
+            log=lambda e: self.stdout.write(
+                f"iteration {e['iteration']:>3}  {e['seconds']:.2f}s  "
+                f"train rmse {e['train_rmse']:.4f}  validation rmse {e['validation_rmse']:.4f}"
+            ),
+        )
+        path = als_model_path(settings.CINEMATCH_MODEL_DIR)
+        model.save(path)
+        self.stdout.write(self.style.SUCCESS(f"Stored ALS factors in {path}."))
+
+    def load_ratings(self, chunk_size):
+        users, movies = {}, {}
+        rows, cols, values = array("i"), array("i"), array("f")
+        for user_id, movie_id, score in Rating.objects.values_list("user_id", "movie_id", "score").iterator(
+            chunk_size=chunk_size
+        ):
+            rows.append(users.setdefault(str(user_id), len(users)))
+            cols.append(movies.setdefault(str(movie_id), len(movies)))
+            values.append(score)
+        ratings = Ratings(
+            np.frombuffer(rows, dtype=np.int32),
+            np.frombuffer(cols, dtype=np.int32),
+            np.frombuffer(values, dtype=np.float32),
+            n_users=len(users),
+            n_items=len(movies),
+        )
+        return ratings, list(users), list(movies)
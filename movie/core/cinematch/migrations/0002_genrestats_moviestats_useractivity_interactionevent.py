@@ -0,0 +1,79 @@
+# Generated by Django 5.2.18 on 2026-10-19 12:25
+
+import django.db.models.deletion
+import django.utils.timezone
+import uuid
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('cinematch', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='GenreStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('genre', models.CharField(max_length=100, unique=True)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('watch_count', models.PositiveIntegerField(default=0)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='MovieStats',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('watch_count', models.PositiveIntegerField(default=0)),
+                ('movie', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='stats', to='cinematch.movie')),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='UserActivity',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('rating_count', models.PositiveIntegerField(default=0)),
+                ('watch_count', models.PositiveIntegerField(default=0)),
+                ('last_event_at', models.DateTimeField(blank=True, null=True)),
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='activity', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'abstract': False,
+            },
+        ),
+        migrations.CreateModel(
+            name='InteractionEvent',
+            fields=[
+                ('id', models.UUIDField(default=uuid.uuid4, primary_key=True, serialize=False, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('event_type', models.CharField(choices=[('rating', 'Rating'), ('watch', 'Watch')], max_length=20)),
+                ('score', models.PositiveSmallIntegerField(blank=True, null=True)),
+                ('occurred_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('movie', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interaction_events', to='cinematch.movie')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='interaction_events', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['user', 'occurred_at'], name='cinematch_i_user_id_34a1b6_idx')],
+            },
+        ),
+    ]
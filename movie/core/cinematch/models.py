@@ -1,3 +1,133 @@
+from django.conf import settings
 from django.db import models
+from django.utils import timezone
 
-# Create your models here.
+from core.base.models import BaseModel
+from core.base.choices import EventTypeChoices
+
+
+class Movie(BaseModel):
+    title = models.CharField(max_length=255)
+    release_year = models.PositiveSmallIntegerField(null=True, blank=True)
+    genres = models.JSONField(default=list, blank=True)
+
+    def __str__(self):
+        return self.title
+
+
+class Rating(BaseModel):
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="ratings"
+    )
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name="ratings"
+    )
+    score = models.PositiveSmallIntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "movie"], name="unique_user_movie_rating"),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} -> {self.movie_id}: {self.score}"
+
+
+class MovieAssociation(BaseModel):
+    """
+    "People who watched X also watched Y", precomputed by the
+    ``build_associations`` command. Rows are ranked per movie so the
+    endpoint is a single indexed range scan on (movie, rank).
+    """
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name="associations"
+    )
+    associated_movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name="+"
+    )
+    rank = models.PositiveSmallIntegerField()
+    co_count = models.PositiveIntegerField()
+    confidence = models.FloatField()
+    lift = models.FloatField()
+
+    class Meta:
+        ordering = ["movie", "rank"]
+        constraints = [
+            models.UniqueConstraint(fields=["movie", "rank"], name="unique_movie_association_rank"),
+        ]
+
+    def __str__(self):
+        return f"{self.movie_id} -> {self.associated_movie_id} (lift={self.lift:.2f})"
+
+
+class InteractionEvent(BaseModel):
+    """
+    Append-only log of rating/watch events. Rows are written in batches by
+    ``cinematch.events`` and never updated; aggregates live in the *Stats
+    tables below.
+    """
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="interaction_events"
+    )
+    movie = models.ForeignKey(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name="interaction_events"
+    )
+    event_type = models.CharField(choices=EventTypeChoices.choices, max_length=20)
+    score = models.PositiveSmallIntegerField(null=True, blank=True)
+    occurred_at = models.DateTimeField(default=timezone.now)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "occurred_at"]),
+        ]
+
+    def __str__(self):
+        return f"{self.user_id} {self.event_type} {self.movie_id}"
+
+
+class MovieStats(BaseModel):
+    movie = models.OneToOneField(
+        Movie,
+        on_delete=models.CASCADE,
+        related_name="stats"
+    )
+    rating_sum = models.BigIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    watch_count = models.PositiveIntegerField(default=0)
+
+    @property
+    def average_rating(self):
+        return self.rating_sum / self.rating_count if self.rating_count else None
+
+
+class GenreStats(BaseModel):
+    genre = models.CharField(max_length=100, unique=True)
+    rating_sum = models.BigIntegerField(default=0)
+    rating_count = models.PositiveIntegerField(default=0)
+    watch_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.genre
+
+
+class UserActivity(BaseModel):
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="activity"
+    )
+    rating_count = models.PositiveIntegerField(default=0)
+    watch_count = models.PositiveIntegerField(default=0)
+    last_event_at = models.DateTimeField(null=True, blank=True)
@@ -0,0 +1,92 @@
+# cinematch/registry.py
+"""Lazily loaded registry of heavy recommender resources (NumPy models, indexes, ...)."""
+
+import gc
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Resource:
+    loader: str
+    warmup: Optional[str] = None
+    value: Any = None
+    loaded: bool = False
+    load_seconds: float = 0.0
+
+
+class ResourceRegistry:
+    def __init__(self):
+        self._resources: dict[str, Resource] = {}
+        self._lock = threading.Lock()
+
+    def register(self, name: str, loader: str, warmup: Optional[str] = None) -> None:
+        """
+        ``loader`` is the dotted path of a zero-argument callable returning
+        the resource, or ``None`` while it has not been built yet; its module
+        is not imported until the resource is first needed. ``warmup``
+        optionally names a callable run once on the freshly loaded value.
+        """
+        self._resources[name] = Resource(loader=loader, warmup=warmup)
+
+    def names(self) -> list[str]:
+        return list(self._resources)
+
+    def is_loaded(self, name: str) -> bool:
+        return self._resources[name].loaded
+
+    def get(self, name: str) -> Any:
+        resource = self._resources[name]
+        if not resource.loaded:
+            with self._lock:
+                if not resource.loaded:
+                    self._load(name, resource)
+        return resource.value
+
+    def reset(self, name: Optional[str] = None) -> None:
+        """Drop loaded values so the next ``get`` reloads them (e.g. after a rebuild)."""
+        with self._lock:
+            for key in [name] if name else self._resources:
+                self._resources[key].value = None
+                self._resources[key].loaded = False
+
+    def warmup(self, names: Optional[list[str]] = None) -> dict[str, float]:
+        """Load (and warm) the given resources now; returns load time per resource."""
+        return {name: self._timed_get(name) for name in names or self.names()}
+
+    def _timed_get(self, name: str) -> float:
+        self.get(name)
+        return self._resources[name].load_seconds
+
+    def _load(self, name: str, resource: Resource) -> None:
+        started = time.perf_counter()
+        value = import_string(resource.loader)()
+        if value is not None and resource.warmup:
+            import_string(resource.warmup)(value)
+        resource.load_seconds = time.perf_counter() - started
+        resource.value = value
+        # A resource that has not been built yet is retried on the next get.
+        resource.loaded = value is not None
+        logger.info("Loaded cinematch resource %r in %.3fs", name, resource.load_seconds)
+
+
+registry = ResourceRegistry()
+
+
+def preload() -> dict[str, float]:
+    """
+    Load every registered resource, then move everything allocated so far
+    into the permanent GC generation so collections in forked workers do
+    not write to (and so un-share) those pages.
+    """
+    timings = registry.warmup()
+    gc.collect()
+    gc.freeze()
+    return timings
@@ -0,0 +1,16 @@
+# apps/cinematch/selectors.py
+
+from cinematch.models import Movie, MovieAssociation
+from django.db.models import QuerySet
+
+def get_also_watched(movie_id: str, limit: int = 20) -> QuerySet[MovieAssociation]:
+    return (
+        MovieAssociation.objects
+        .filter(movie_id=movie_id)
+        .select_related("associated_movie")
+        .order_by("rank")[:limit]
+    )
+
+def get_movies_in_order(movie_ids: list[str]) -> list[Movie]:
+    movies = {str(pk): movie for pk, movie in Movie.objects.in_bulk(movie_ids).items()}
+    return [movies[m] for m in movie_ids if m in movies]
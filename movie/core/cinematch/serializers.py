@@ -0,0 +1,36 @@
+from rest_framework import serializers
+from cinematch.models import Movie, MovieAssociation
+from core.base.choices import EventTypeChoices, FeedbackChoices, RailChoices
+
+class MovieSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = Movie
+        fields = ["id", "title", "release_year", "genres"]
+
+class MovieAssociationSerializer(serializers.ModelSerializer):
+    movie = MovieSerializer(source="associated_movie")
+
+    class Meta:
+        model = MovieAssociation
+        fields = ["movie", "rank", "co_count", "confidence", "lift"]
+
+class EventSerializer(serializers.Serializer):
+    # Plain UUID rather than a related field: validating the movie here would
+    # cost a query per event, the batcher drops unknown movies instead.
+    movie = serializers.UUIDField()
+    event_type = serializers.ChoiceField(choices=EventTypeChoices.choices)
+    score = serializers.IntegerField(min_value=1, max_value=5, required=False)
+
+    def validate(self, attrs):
+        if attrs["event_type"] == EventTypeChoices.RATING and attrs.get("score") is None:
+            raise serializers.ValidationError({"score": "Rating events require a score."})
+        return attrs
+
+class ScoredMovieSerializer(serializers.Serializer):
+    movie = MovieSerializer()
+    score = serializers.FloatField()
+
+class FeedbackSerializer(serializers.Serializer):
+    rail = serializers.ChoiceField(choices=RailChoices.choices)
+    movie = serializers.UUIDField()
+    kind = serializers.ChoiceField(choices=FeedbackChoices.choices)
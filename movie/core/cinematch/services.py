@@ -0,0 +1,224 @@
+# apps/cinematch/services.py
+
+import operator
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from functools import reduce
+from typing import Iterable, Optional
+
+from django.db import connection, models, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from cinematch.models import GenreStats, InteractionEvent, Movie, MovieStats, Rating, UserActivity
+from core.base.choices import EventTypeChoices
+from users.models import CustomUser
+
+
+@dataclass
+class Event:
+    user_id: uuid.UUID
+    movie_id: uuid.UUID
+    event_type: str
+    score: Optional[int] = None
+    occurred_at: datetime = field(default_factory=timezone.now)
+
+
+@dataclass
+class Feedback:
+    rail: str
+    movie_id: str
+    kind: str  # FeedbackChoices
+
+
+
+def upsert_increment(
+    model: type[models.Model],
+    conflict_field: str,
+    rows: dict,
+    latest_field: Optional[str] = None,
+) -> None:
+    """
+    Add ``rows`` ({conflict value: {column: delta}}) onto ``model`` with one
+    multi-row ``INSERT ... ON CONFLICT DO UPDATE SET col = col + EXCLUDED.col``.
+    ``latest_field`` is kept at the newer of the stored and incoming values.
+    Rows are written in key order so concurrent flushes lock in the same order.
+    """
+    if not rows:
+        return
+
+    opts = model._meta
+    qn = connection.ops.quote_name
+    table = qn(opts.db_table)
+    now = timezone.now()
+    value_fields = list(next(iter(rows.values())))
+    columns = ["id", "created_at", "updated_at", conflict_field, *value_fields]
+    db_fields = [opts.get_field(name) for name in columns]
+
+    params = []
+    for key in sorted(rows, key=str):
+        values = [uuid.uuid4(), now, now, key, *(rows[key][name] for name in value_fields)]
+        params.extend(f.get_db_prep_save(v, connection) for f, v in zip(db_fields, values))
+
+    updates = [f"{qn('updated_at')} = EXCLUDED.{qn('updated_at')}"]
+    for name, db_field in zip(value_fields, db_fields[4:]):
+        column = qn(db_field.column)
+        if name == latest_field:
+            updates.append(
+                f"{column} = CASE WHEN {table}.{column} IS NULL OR EXCLUDED.{column} > {table}.{column} "
+                f"THEN EXCLUDED.{column} ELSE {table}.{column} END"
+            )
+        else:
+            updates.append(f"{column} = {table}.{column} + EXCLUDED.{column}")
+
+    row_sql = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    sql = (
+        f"INSERT INTO {table} ({', '.join(qn(f.column) for f in db_fields)}) "
+        f"VALUES {', '.join([row_sql] * len(rows))} "
+        f"ON CONFLICT ({qn(opts.get_field(conflict_field).column)}) DO UPDATE SET {', '.join(updates)}"
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+
+
+def insert_new_ratings(ratings: dict) -> set:
+    """
+    Insert the (user, movie) pairs of ``ratings`` that have no row yet with
+    ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` and return the pairs
+    this statement inserted. A pair another transaction is inserting at the
+    same time waits for it and is then reported as existing, so exactly one
+    of two concurrent flushes counts it as new.
+    """
+    opts = Rating._meta
+    qn = connection.ops.quote_name
+    now = timezone.now()
+    columns = ["id", "created_at", "updated_at", "user", "movie", "score"]
+    db_fields = [opts.get_field(name) for name in columns]
+
+    params = []
+    for user_id, movie_id in sorted(ratings, key=str):
+        values = [uuid.uuid4(), now, now, user_id, movie_id, ratings[(user_id, movie_id)]]
+        params.extend(f.get_db_prep_save(v, connection) for f, v in zip(db_fields, values))
+
+    user_column, movie_column = (qn(f.column) for f in db_fields[3:5])
+    row_sql = "(" + ", ".join(["%s"] * len(columns)) + ")"
+    sql = (
+        f"INSERT INTO {qn(opts.db_table)} ({', '.join(qn(f.column) for f in db_fields)}) "
+        f"VALUES {', '.join([row_sql] * len(ratings))} "
+        f"ON CONFLICT ({user_column}, {movie_column}) DO NOTHING "
+        f"RETURNING {user_column}, {movie_column}"
+    )
+    user_pk, movie_pk = (f.target_field for f in db_fields[3:5])
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return {(user_pk.to_python(user), movie_pk.to_python(movie)) for user, movie in cursor.fetchall()}
+
+
+def apply_events(events: Iterable[Event]) -> int:
+    """
+    Fold a batch of events into the event log, ``Rating`` and the aggregate
+    tables. The whole batch costs a fixed number of statements regardless of
+    its size: two lookups, one insert for the log, three for the ratings
+    (insert new, lock existing, update) and one upsert per aggregate table.
+    Returns the number of events applied.
+    """
+    events = list(events)
+    genres = dict(
+        Movie.objects
+        .filter(id__in={e.movie_id for e in events})
+        .values_list("id", "genres")
+    )
+    users = set(
+        CustomUser.objects
+        .filter(id__in={e.user_id for e in events})
+        .values_list("id", flat=True)
+    )
+    # Events for unknown movies or deleted users would fail the whole batch
+    # on the FK.
+    events = [e for e in events if e.movie_id in genres and e.user_id in users]
+    if not events:
+        return 0
+
+    # Only the last rating per (user, movie) in a batch counts; earlier ones
+    # were overwritten before they ever reached the table.
+    ratings = {}
+    for event in events:
+        if event.event_type == EventTypeChoices.RATING:
+            ratings[(event.user_id, event.movie_id)] = event.score
+
+    with transaction.atomic():
+        _apply_batch(events, ratings, genres)
+    return len(events)
+
+
+def _apply_batch(events: list[Event], ratings: dict, genres: dict) -> None:
+    # The rating deltas must come from the scores this transaction replaces,
+    # not from a read before it: other workers flush the same pairs
+    # concurrently. New pairs are claimed by the insert, existing ones are
+    # locked before their old score is read.
+    previous = {}
+    if ratings:
+        inserted = insert_new_ratings(ratings)
+        updated = {pair: score for pair, score in ratings.items() if pair not in inserted}
+        if updated:
+            # Lock exactly the re-rated pairs; an IN on users and movies
+            # would also lock every other rating in their cross product.
+            pairs = reduce(operator.or_, (Q(user_id=user, movie_id=movie) for user, movie in updated))
+            existing = (
+                Rating.objects
+                .select_for_update()
+                .filter(pairs)
+                .order_by("user_id", "movie_id")
+                .values_list("user_id", "movie_id", "score")
+            )
+            previous = {(user, movie): score for user, movie, score in existing}
+            Rating.objects.bulk_create(
+                [
+                    Rating(user_id=user_id, movie_id=movie_id, score=score)
+                    for (user_id, movie_id), score in updated.items()
+                ],
+                update_conflicts=True,
+                unique_fields=["user", "movie"],
+                update_fields=["score", "updated_at"],
+            )
+        previous.update(dict.fromkeys(inserted))
+
+    movie_rows = defaultdict(lambda: {"rating_sum": 0, "rating_count": 0, "watch_count": 0})
+    genre_rows = defaultdict(lambda: {"rating_sum": 0, "rating_count": 0, "watch_count": 0})
+    user_rows = defaultdict(lambda: {"rating_count": 0, "watch_count": 0, "last_event_at": None})
+
+    def add(movie_id, column, delta):
+        movie_rows[movie_id][column] += delta
+        for genre in genres[movie_id]:
+            genre_rows[genre][column] += delta
+
+    for (user_id, movie_id), score in ratings.items():
+        old = previous.get((user_id, movie_id))
+        add(movie_id, "rating_sum", score - (old or 0))
+        if old is None:
+            add(movie_id, "rating_count", 1)
+            user_rows[user_id]["rating_count"] += 1
+
+    for event in events:
+        row = user_rows[event.user_id]
+        if row["last_event_at"] is None or event.occurred_at > row["last_event_at"]:
+            row["last_event_at"] = event.occurred_at
+        if event.event_type == EventTypeChoices.WATCH:
+            add(event.movie_id, "watch_count", 1)
+            row["watch_count"] += 1
+
+    InteractionEvent.objects.bulk_create([
+        InteractionEvent(
+            user_id=e.user_id,
+            movie_id=e.movie_id,
+            event_type=e.event_type,
+            score=e.score,
+            occurred_at=e.occurred_at,
+        )
+        for e in events
+    ])
+    upsert_increment(MovieStats, "movie_id", movie_rows)
+    upsert_increment(GenreStats, "genre", genre_rows)
+    upsert_increment(UserActivity, "user_id", user_rows, latest_field="last_event_at")
@@ -0,0 +1,73 @@
+# cinematch/sessions.py
+"""Session-aware "next movie" recommendations."""
+
+from django.conf import settings
+from django.core.cache import cache
+
+from cinematch.registry import registry
+from core.base.choices import RailChoices
+
+RECENT_SEQ_KEY = "cinematch:recent:{user_id}:seq"
+RECENT_SLOT_KEY = "cinematch:recent:{user_id}:{slot}"
+
+
+def get_recent(user_id) -> list[str]:
+    """Distinct movies among the user's most recent interactions, oldest first."""
+    length = settings.CINEMATCH_SESSION_LENGTH
+    seq = cache.get(RECENT_SEQ_KEY.format(user_id=user_id))
+    if not seq:
+        return []
+    slots = cache.get_many([
+        RECENT_SLOT_KEY.format(user_id=user_id, slot=n % length)
+        for n in range(max(seq - length, 0) + 1, seq + 1)
+    ])
+    # A slot can still hold an entry from the previous lap if its writer has
+    # not stored the new one yet; the sequence number tells them apart.
+    entries = sorted(entry for entry in slots.values() if entry[0] > seq - length)
+    latest = dict.fromkeys(movie_id for _, movie_id in reversed(entries))
+    return list(reversed(latest))
+
+
+def push_recent(user_id, movie_id) -> None:
+    """
+    Append to the user's ring buffer. Each push claims a sequence number with
+    an atomic ``cache.incr`` and writes only its own slot, so concurrent
+    requests for one user never overwrite each other's entries.
+    """
+    ttl = settings.CINEMATCH_SESSION_TTL
+    seq_key = RECENT_SEQ_KEY.format(user_id=user_id)
+    cache.add(seq_key, 0, ttl)
+    try:
+        seq = cache.incr(seq_key)
+    except ValueError:
+        # Expired between add and incr.
+        cache.add(seq_key, 0, ttl)
+        seq = cache.incr(seq_key)
+    slot = RECENT_SLOT_KEY.format(user_id=user_id, slot=seq % settings.CINEMATCH_SESSION_LENGTH)
+    cache.set(slot, (seq, str(movie_id)), ttl)
+    cache.touch(seq_key, ttl)
+
+
+def recommend_next(user_id, limit: int = 10, explore: bool = True) -> list[tuple[str, float]]:
+    """
+    Top ``limit`` successors of the user's session. With ``explore`` a wider
+    candidate pool is re-ranked by the bandit on the ``next`` rail.
+    """
+    model = registry.get("transitions")
+    if model is None:
+        return []
+    if not explore:
+        return model.recommend(get_recent(user_id), limit=limit)
+
+    scored = model.recommend(get_recent(user_id), limit=limit * 3)
+    if not scored:
+        return []
+    scores = dict(scored)
+    best = scored[0][1]
+    order = registry.get("bandit").rerank(
+        RailChoices.NEXT,
+        [movie_id for movie_id, _ in scored],
+        limit,
+        priors=[score / best for _, score in scored],
+    )
+    return [(movie_id, scores[movie_id]) for movie_id in order]
@@ -1,3 +1,526 @@
-from django.test import TestCase
+import os
+import tempfile
+from functools import partial
+from io import StringIO
+from pathlib import Path
+from unittest import mock
 
-# Create your tests here.
+import numpy as np
+from django.core.cache import cache
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from authentication.utils import get_tokens
+from cinematch import events
+from cinematch.als import ALSModel, Ratings, als_model_path, train_als
+from cinematch.associations import mine_associations
+from cinematch.bandit import LOCK_KEY, STATS_KEY, ArmStats, BanditPolicy, _rail_lock
+from cinematch.events import EventBatcher
+from cinematch.models import (
+    GenreStats,
+    InteractionEvent,
+    Movie,
+    MovieAssociation,
+    MovieStats,
+    Rating,
+    UserActivity,
+)
+from cinematch.registry import ResourceRegistry, registry
+from cinematch.services import Event, Feedback, apply_events
+from cinematch.sessions import RECENT_SEQ_KEY, get_recent, push_recent, recommend_next
+from cinematch.transitions import TransitionModel
+from core.base.choices import EventTypeChoices, FeedbackChoices
+from core.base.querycount import QueryBudgetTestMixin
+from users.models import CustomUser
+
+
+# Movies 0 and 1 are co-watched twice, every other pair once. Item counts
+# are 3, 3, 2, 2, 1 over 5 users, so some neighbours tie on lift and count.
+HISTORIES = [[0, 1], [0, 1, 2], [2, 3], [1, 3], [0, 4]]
+
+
+def mine(**kwargs):
+    options = {"min_support": 1, "workers": 1, **kwargs}
+    return dict(mine_associations(HISTORIES, 5, **options))
+
+
+class MineAssociationsTests(TestCase):
+    def test_counts_confidence_and_lift(self):
+        neighbours = {b: (count, confidence, lift) for b, count, confidence, lift in mine()[0]}
+        count, confidence, lift = neighbours[1]
+        self.assertEqual(count, 2)
+        self.assertAlmostEqual(confidence, 2 / 3)
+        self.assertAlmostEqual(lift, 2 * 5 / (3 * 3))
+        self.assertAlmostEqual(neighbours[4][2], 1 * 5 / (3 * 1))
+        self.assertNotIn(3, neighbours)
+
+    def test_ranks_by_lift_then_count_then_index(self):
+        self.assertEqual([n[0] for n in mine()[0]], [4, 1, 2])
+        self.assertEqual([n[0] for n in mine()[1]], [0, 2, 3])
+        self.assertEqual([n[0] for n in mine()[2]], [3, 0, 1])
+
+    def test_min_support_and_top_n(self):
+        self.assertEqual(mine(min_support=2), {0: [mine()[0][1]], 1: [mine()[1][0]]})
+        self.assertTrue(all(len(neighbours) == 1 for neighbours in mine(top_n=1).values()))
+
+    def test_spilling_and_workers_do_not_change_results(self):
+        expected = mine()
+        self.assertEqual(mine(max_pairs=1, num_shards=2, batch_users=1), expected)
+        self.assertEqual(mine(workers=2, max_pairs=1, num_shards=2, batch_users=1), expected)
+
+
+class BuildAssociationsTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.movies = [Movie.objects.create(title=f"Movie {i}") for i in range(3)]
+        for i, history in enumerate([[0, 1], [0, 1], [0, 2]]):
+            user = CustomUser.objects.create_user(email=f"user{i}@example.com", username=f"user{i}")
+            for movie in history:
+                Rating.objects.create(user=user, movie=cls.movies[movie], score=4)
+
+    def test_stores_ranked_associations_and_serves_them(self):
+        call_command("build_associations", min_support=1, workers=1, stdout=StringIO())
+        self.assertEqual(MovieAssociation.objects.count(), 4)
+
+        path = reverse("movie-also-watched", kwargs={"id": self.movies[0].id})
+        response = self.assertQueryBudget("get", path)
+        self.assertEqual(response.status_code, 200)
+        rows = response.json()
+        self.assertEqual([row["rank"] for row in rows], [1, 2])
+        self.assertEqual(rows[0]["movie"]["id"], str(self.movies[1].id))
+        self.assertEqual(rows[0]["co_count"], 2)
+
+
+class ApplyEventsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            CustomUser.objects.create_user(email=f"user{i}@example.com", username=f"user{i}")
+            for i in range(3)
+        ]
+        cls.heat = Movie.objects.create(title="Heat", genres=["Crime", "Drama"])
+        cls.alien = Movie.objects.create(title="Alien", genres=["Horror"])
+
+    def rate(self, user, movie, score):
+        return Event(user_id=user.id, movie_id=movie.id, event_type=EventTypeChoices.RATING, score=score)
+
+    def watch(self, user, movie):
+        return Event(user_id=user.id, movie_id=movie.id, event_type=EventTypeChoices.WATCH)
+
+    def test_folds_batch_into_aggregates(self):
+        a, b, c = self.users
+        apply_events([
+            self.rate(a, self.heat, 4),
+            self.rate(b, self.heat, 2),
+            self.watch(a, self.heat),
+            self.watch(c, self.alien),
+        ])
+
+        heat = MovieStats.objects.get(movie=self.heat)
+        self.assertEqual((heat.rating_sum, heat.rating_count, heat.watch_count), (6, 2, 1))
+        crime = GenreStats.objects.get(genre="Crime")
+        self.assertEqual((crime.rating_sum, crime.rating_count, crime.watch_count), (6, 2, 1))
+        self.assertEqual(GenreStats.objects.get(genre="Horror").watch_count, 1)
+        activity = UserActivity.objects.get(user=a)
+        self.assertEqual((activity.rating_count, activity.watch_count), (1, 1))
+        self.assertEqual(InteractionEvent.objects.count(), 4)
+
+    def test_rerating_adjusts_sum_without_recounting(self):
+        a, _, _ = self.users
+        apply_events([self.rate(a, self.heat, 2)])
+        apply_events([self.rate(a, self.heat, 3), self.rate(a, self.heat, 5)])
+
+        heat = MovieStats.objects.get(movie=self.heat)
+        self.assertEqual((heat.rating_sum, heat.rating_count), (5, 1))
+        self.assertEqual(Rating.objects.get(user=a, movie=self.heat).score, 5)
+        self.assertEqual(UserActivity.objects.get(user=a).rating_count, 1)
+
+    def test_statement_count_does_not_grow_with_batch(self):
+        batch = [self.rate(user, movie, 3) for user in self.users for movie in (self.heat, self.alien)]
+        with CaptureQueriesContext(connection) as small:
+            apply_events(batch[:1])
+        Rating.objects.all().delete()
+        with CaptureQueriesContext(connection) as large:
+            apply_events(batch)
+        self.assertEqual(len(small), len(large))
+
+    def test_unknown_movie_is_dropped(self):
+        a, _, _ = self.users
+        missing = Movie(title="Missing")
+        self.assertEqual(apply_events([self.watch(a, missing), self.watch(a, self.alien)]), 1)
+        self.assertEqual(InteractionEvent.objects.count(), 1)
+
+    def test_deleted_user_is_dropped(self):
+        a, b, _ = self.users
+        batch = [self.rate(a, self.heat, 4), self.rate(b, self.heat, 2)]
+        b.delete()
+        self.assertEqual(apply_events(batch), 1)
+        heat = MovieStats.objects.get(movie=self.heat)
+        self.assertEqual((heat.rating_sum, heat.rating_count), (4, 1))
+
+    def test_existing_rating_is_not_counted_again(self):
+        a, b, _ = self.users
+        Rating.objects.create(user=a, movie=self.heat, score=2)
+        apply_events([self.rate(a, self.heat, 5), self.rate(b, self.heat, 3)])
+        self.assertEqual(
+            dict(Rating.objects.filter(movie=self.heat).values_list("user_id", "score")),
+            {a.id: 5, b.id: 3},
+        )
+        heat = MovieStats.objects.get(movie=self.heat)
+        self.assertEqual((heat.rating_sum, heat.rating_count), (3 + 5 - 2, 1))
+
+
+class EventBatcherTests(TestCase):
+    def setUp(self):
+        start = mock.patch.object(EventBatcher, "_start")
+        start.start()
+        self.addCleanup(start.stop)
+
+    def test_flushes_in_slices_of_max_batch(self):
+        apply = mock.Mock(side_effect=len)
+        batcher = EventBatcher(interval_ms=1000, max_batch=2, apply=apply)
+        for i in range(5):
+            batcher.record(i)
+        self.assertEqual(batcher.flush(), 5)
+        self.assertEqual([call.args[0] for call in apply.call_args_list], [[0, 1], [2, 3], [4]])
+
+    def test_retries_once_then_keeps_the_rest(self):
+        apply = mock.Mock(side_effect=[RuntimeError, 2, RuntimeError, RuntimeError, 1])
+        batcher = EventBatcher(interval_ms=1000, max_batch=2, apply=apply)
+        for i in range(5):
+            batcher.record(i)
+        with self.assertLogs("cinematch.events", "WARNING"):
+            # [0, 1] succeeds on retry, [2, 3] fails twice and is dropped.
+            self.assertEqual(batcher.flush(), 2)
+        self.assertEqual(batcher.flush(), 1)
+        self.assertEqual(apply.call_args_list[-1].args[0], [4])
+
+
+class EventIngestViewTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email="viewer@example.com", username="viewer")
+        cls.movie = Movie.objects.create(title="Heat", genres=["Crime"])
+
+    def setUp(self):
+        # Keep events buffered; the test flushes explicitly on its own connection.
+        patcher = mock.patch.object(events, "_batcher", EventBatcher(interval_ms=1000, max_batch=100))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        start = mock.patch.object(EventBatcher, "_start")
+        start.start()
+        self.addCleanup(start.stop)
+
+    def test_events_are_buffered_then_flushed(self):
+        response = self.assertQueryBudget(
+            "post",
+            reverse("event-ingest"),
+            [
+                {"movie": str(self.movie.id), "event_type": "rating", "score": 4},
+                {"movie": str(self.movie.id), "event_type": "watch"},
+            ],
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens(self.user)[0]}",
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertFalse(MovieStats.objects.exists())
+
+        self.assertEqual(events.flush_events(), 2)
+        stats = MovieStats.objects.get(movie=self.movie)
+        self.assertEqual((stats.rating_sum, stats.watch_count), (4, 1))
+
+    def test_rating_requires_score(self):
+        response = self.client.post(
+            reverse("event-ingest"),
+            {"movie": str(self.movie.id), "event_type": "rating"},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens(self.user)[0]}",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class TransitionModelTests(TestCase):
+    def test_recommends_successors_of_recent_items(self):
+        movie_ids = ["a", "b", "c", "d"]
+        # a is mostly followed by b, sometimes by c; d never follows anything.
+        sequences = [[0, 1, 2], [0, 1], [0, 2], [3]]
+        model = TransitionModel.build(movie_ids, sequences, window=1)
+
+        self.assertEqual([m for m, _ in model.recommend(["a"])], ["b", "c"])
+        self.assertEqual([m for m, _ in model.recommend(["a", "b"])], ["c"])
+        self.assertEqual(model.recommend(["unknown"]), [])
+
+    def test_keeps_top_m_successors(self):
+        model = TransitionModel.build(["a", "b", "c"], [[0, 1], [0, 1], [0, 2]], window=1, top_m=1)
+        self.assertEqual(model.recommend(["a"]), [("b", 1.0)])
+
+    def test_save_replaces_artifact_atomically(self):
+        model = TransitionModel.build(["a", "b"], [[0, 1]], window=1)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = Path(tmp) / "transitions.npz"
+            model.save(path)
+            with mock.patch("numpy.savez", side_effect=OSError("disk full")), self.assertRaises(OSError):
+                TransitionModel.build(["c"], [], window=1).save(path)
+            # The failed rebuild left the previous artifact intact and no temp file behind.
+            self.assertEqual(os.listdir(tmp), ["transitions.npz"])
+            self.assertEqual(TransitionModel.load(path).recommend(["a"]), [("b", 1.0)])
+
+
+class RecentBufferTests(TestCase):
+    def setUp(self):
+        self.addCleanup(cache.clear)
+
+    @override_settings(CINEMATCH_SESSION_LENGTH=3)
+    def test_keeps_latest_distinct_movies_oldest_first(self):
+        for movie_id in ["a", "b", "a", "c", "d"]:
+            push_recent("user", movie_id)
+        self.assertEqual(get_recent("user"), ["a", "c", "d"])
+        self.assertEqual(get_recent("other"), [])
+
+    @override_settings(CINEMATCH_SESSION_LENGTH=3)
+    def test_skips_slots_left_from_previous_lap(self):
+        for movie_id in ["a", "b", "c"]:
+            push_recent("user", movie_id)
+        # A writer that claimed sequence 4 but has not stored its slot yet.
+        cache.incr(RECENT_SEQ_KEY.format(user_id="user"))
+        self.assertEqual(get_recent("user"), ["b", "c"])
+
+
+class NextMovieViewTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email="viewer@example.com", username="viewer")
+        cls.movies = [Movie.objects.create(title=f"Movie {i}") for i in range(3)]
+
+    def test_scores_recent_session(self):
+        first, second, third = (str(m.id) for m in self.movies)
+        model = TransitionModel.build([first, second, third], [[0, 1], [0, 1], [0, 2]], window=1)
+        push_recent(self.user.id, first)
+
+        get = registry.get
+        with mock.patch.object(registry, "get", lambda name: model if name == "transitions" else get(name)):
+            response = self.assertQueryBudget(
+                "get",
+                reverse("recommendations-next"),
+                HTTP_AUTHORIZATION=f"Bearer {get_tokens(self.user)[0]}",
+            )
+
+        self.assertEqual(response.status_code, 200)
+        # The bandit may reorder the candidates, but only successors are offered.
+        self.assertCountEqual([r["movie"]["id"] for r in response.json()], [second, third])
+
+    def test_explore_off_keeps_model_order(self):
+        first, second, third = (str(m.id) for m in self.movies)
+        model = TransitionModel.build([first, second, third], [[0, 1], [0, 1], [0, 2]], window=1)
+        push_recent(self.user.id, first)
+
+        with mock.patch.object(registry, "get", return_value=model):
+            self.assertEqual([m for m, _ in recommend_next(self.user.id, explore=False)], [second, third])
+
+
+def _load_counter():
+    _load_counter.calls += 1
+    return _load_counter.value
+
+
+class ResourceRegistryTests(TestCase):
+    def setUp(self):
+        _load_counter.calls = 0
+        _load_counter.value = None
+        self.registry = ResourceRegistry()
+        self.registry.register("counter", loader=f"{__name__}._load_counter")
+
+    def test_loads_lazily_once_built(self):
+        self.assertFalse(self.registry.is_loaded("counter"))
+        self.assertIsNone(self.registry.get("counter"))
+        # Not built yet: retried rather than cached.
+        _load_counter.value = "model"
+        self.assertEqual(self.registry.get("counter"), "model")
+        self.assertEqual(self.registry.get("counter"), "model")
+        self.assertEqual(_load_counter.calls, 2)
+
+    def test_warmup_and_reset(self):
+        _load_counter.value = "model"
+        self.assertEqual(list(self.registry.warmup()), ["counter"])
+        self.assertTrue(self.registry.is_loaded("counter"))
+        self.registry.reset()
+        self.assertFalse(self.registry.is_loaded("counter"))
+
+
+class StartupProfileTests(TestCase):
+    def test_reports_header_and_total(self):
+        out = StringIO()
+        call_command("startup_profile", limit=1, stdout=out)
+        lines = out.getvalue().splitlines()
+        self.assertTrue(lines[0].startswith("app / package"))
+        self.assertEqual(len(lines), 3)
+        self.assertTrue(lines[-1].startswith("total"))
+
+    def test_failed_start_without_stderr(self):
+        failed = mock.Mock(returncode=3, stderr="")
+        with mock.patch("subprocess.run", return_value=failed):
+            with self.assertRaisesMessage(CommandError, "exited with code 3"):
+                call_command("startup_profile", stdout=StringIO())
+
+
+class BanditTests(TestCase):
+    def setUp(self):
+        self.policy = BanditPolicy(half_life=3600, refresh=0, prior_weight=2.0, max_arms=100)
+        self.addCleanup(cache.clear)
+
+    def feedback(self, movie_id, kind, count):
+        return [Feedback(rail="next", movie_id=movie_id, kind=kind) for _ in range(count)]
+
+    def test_counts_decay_with_half_life(self):
+        stats = ArmStats()
+        stats.add(["a", "a", "b"], np.array([False, True, False]), now=stats.updated_at, half_life=60)
+        np.testing.assert_array_equal(stats.impressions, [1, 1])
+        np.testing.assert_array_equal(stats.clicks, [1, 0])
+
+        stats.add(["b"], np.array([False]), now=stats.updated_at + 60, half_life=60)
+        np.testing.assert_allclose(stats.impressions, [0.5, 1.5])
+        np.testing.assert_allclose(stats.clicks, [0.5, 0])
+
+    def test_converting_arm_wins(self):
+        self.policy.apply_feedback(
+            self.feedback("good", FeedbackChoices.IMPRESSION, 200)
+            + self.feedback("good", FeedbackChoices.CLICK, 100)
+            + self.feedback("bad", FeedbackChoices.IMPRESSION, 200)
+        )
+        for policy in ("thompson", "ucb"):
+            self.assertEqual(self.policy.rerank("next", ["bad", "good"], 1, policy=policy), ["good"])
+
+    def test_unseen_arms_follow_priors(self):
+        order = self.policy.rerank("next", ["low", "high"], 2, priors=np.array([0.0, 1.0]), policy="ucb")
+        self.assertEqual(order, ["high", "low"])
+
+    def test_prunes_faded_and_excess_arms(self):
+        stats = ArmStats()
+        stats.add(["old"], np.array([False]), now=stats.updated_at, half_life=60)
+        stats.add(["a", "a", "b", "c"], np.array([False] * 4), now=stats.updated_at + 600, half_life=60)
+        stats.prune(max_arms=2)
+        self.assertEqual(stats.arm_ids, ["a", "b"])
+        np.testing.assert_array_equal(stats.impressions, [2, 1])
+        self.assertEqual(stats.lookup(["b", "old"]).tolist(), [1, -1])
+
+    def test_skips_batch_when_rail_is_locked(self):
+        cache.set(LOCK_KEY.format(rail="next"), "other")
+        with mock.patch("cinematch.bandit._rail_lock", partial(_rail_lock, timeout=0)), \
+                self.assertLogs("cinematch.bandit", "WARNING"):
+            self.assertEqual(self.policy.apply_feedback(self.feedback("a", FeedbackChoices.CLICK, 1)), 0)
+        # The other holder's lock is left in place.
+        self.assertEqual(cache.get(LOCK_KEY.format(rail="next")), "other")
+        self.assertIsNone(cache.get(STATS_KEY.format(rail="next")))
+
+    def test_releases_only_its_own_lock(self):
+        with _rail_lock("next") as acquired:
+            self.assertTrue(acquired)
+            # Expired and taken over by another process meanwhile.
+            cache.set(LOCK_KEY.format(rail="next"), "other")
+        self.assertEqual(cache.get(LOCK_KEY.format(rail="next")), "other")
+
+    def test_forked_worker_gets_its_own_generator(self):
+        parent = self.policy.rng
+        self.assertIs(self.policy.rng, parent)
+        with mock.patch("cinematch.bandit.os.getpid", return_value=-1):
+            self.assertIsNot(self.policy.rng, parent)
+
+
+class FeedbackViewTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = CustomUser.objects.create_user(email="viewer@example.com", username="viewer")
+        cls.movie = Movie.objects.create(title="Heat")
+
+    def setUp(self):
+        patcher = mock.patch.object(
+            events, "_feedback_batcher",
+            EventBatcher(interval_ms=1000, max_batch=100, apply=events._apply_feedback),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        start = mock.patch.object(EventBatcher, "_start")
+        start.start()
+        self.addCleanup(start.stop)
+        self.addCleanup(cache.clear)
+
+    def test_feedback_is_buffered_then_folded(self):
+        response = self.assertQueryBudget(
+            "post",
+            reverse("rail-feedback"),
+            [
+                {"rail": "next", "movie": str(self.movie.id), "kind": "impression"},
+                {"rail": "next", "movie": str(self.movie.id), "kind": "click"},
+            ],
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens(self.user)[0]}",
+        )
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(events.flush_feedback(), 2)
+
+        stats = registry.get("bandit").get_stats("next")
+        row = stats.index[str(self.movie.id)]
+        self.assertEqual((stats.impressions[row], stats.clicks[row]), (1, 1))
+
+    def test_unknown_rail_is_rejected(self):
+        response = self.client.post(
+            reverse("rail-feedback"),
+            {"rail": "anything", "movie": str(self.movie.id), "kind": "click"},
+            content_type="application/json",
+            HTTP_AUTHORIZATION=f"Bearer {get_tokens(self.user)[0]}",
+        )
+        self.assertEqual(response.status_code, 400)
+
+
+class ALSTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        rng = np.random.default_rng(0)
+        n_users, n_items, k, n = 300, 80, 4, 6000
+        users = rng.integers(0, n_users, n).astype(np.int32)
+        items = rng.integers(0, n_items, n).astype(np.int32)
+        truth = np.einsum("ij,ij->i", rng.normal(size=(n_users, k))[users], rng.normal(size=(n_items, k))[items])
+        values = (3 + 0.3 * truth + rng.normal(scale=0.1, size=n)).astype(np.float32)
+        cls.train, cls.validation = Ratings(users, items, values, n_users, n_items).split(0.1)
+
+    def test_learns_and_matches_across_worker_counts(self):
+        serial = train_als(self.train, self.validation, factors=4, iterations=5, workers=1)
+        parallel = train_als(self.train, self.validation, factors=4, iterations=5, workers=2)
+
+        history = [entry["validation_rmse"] for entry in serial.history]
+        self.assertLess(history[-1], history[0])
+        np.testing.assert_allclose(serial.item_factors, parallel.item_factors)
+
+    def test_trained_model_recommends_by_id(self):
+        user_ids = np.array([f"user{i}" for i in range(self.train.n_users)])
+        movie_ids = np.array([f"movie{i}" for i in range(self.train.n_items)])
+        model = train_als(
+            self.train, factors=4, iterations=2, workers=1, user_ids=user_ids, movie_ids=movie_ids
+        )
+        recommended = model.recommend("user0", limit=3)
+        self.assertEqual(len(recommended), 3)
+        self.assertTrue(all(movie_id.startswith("movie") for movie_id, _ in recommended))
+
+    def test_command_stores_loadable_model(self):
+        user = CustomUser.objects.create_user(email="viewer@example.com", username="viewer")
+        movies = [Movie.objects.create(title=f"Movie {i}") for i in range(3)]
+        for movie, score in zip(movies, [5, 3, 1]):
+            Rating.objects.create(user=user, movie=movie, score=score)
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(CINEMATCH_MODEL_DIR=tmp):
+            call_command(
+                "train_als", factors=2, iterations=1, validation=0.0, workers=1, stdout=StringIO()
+            )
+            model = ALSModel.load(als_model_path(tmp))
+        self.assertEqual(len(model.recommend(str(user.id), limit=2)), 2)
+
+    def test_stops_early_and_keeps_best_factors(self):
+        # Heavy regularisation plateaus almost immediately.
+        model = train_als(self.train, self.validation, factors=4, reg=50.0, iterations=20, patience=1, workers=1)
+        self.assertLess(len(model.history), 20)
+        best = min(entry["validation_rmse"] for entry in model.history)
+        self.assertAlmostEqual(model.rmse(self.validation), best)
@@ -0,0 +1,126 @@
+# cinematch/transitions.py
+"""Item-to-item transition model for next-movie recommendations."""
+
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Optional
+
+import numpy as np
+from django.conf import settings
+
+from cinematch.artifacts import save_npz
+
+
+@dataclass
+class TransitionModel:
+    """Row ``i`` holds the top-M movies that tend to follow movie ``i``, as CSR arrays."""
+    movie_ids: np.ndarray  # str, index -> movie id
+    indptr: np.ndarray     # int64, len(movie_ids) + 1
+    indices: np.ndarray    # int32
+    data: np.ndarray       # float32, row-normalised transition weights
+
+    def __post_init__(self):
+        self.index = {movie_id: i for i, movie_id in enumerate(self.movie_ids.tolist())}
+
+    @classmethod
+    def build(
+        cls,
+        movie_ids: list[str],
+        sequences: Iterable[list[int]],
+        window: int = 3,
+        decay: float = 0.5,
+        top_m: int = 100,
+        chunk_pairs: int = 5_000_000,
+    ) -> "TransitionModel":
+        """
+        Count ``a -> b`` whenever ``b`` follows ``a`` within ``window`` steps
+        of a sequence, weighting the k-th successor by ``decay ** (k - 1)``.
+        Pairs are collected in flat arrays and folded every ``chunk_pairs``
+        so memory tracks distinct pairs, not sequence length.
+        """
+        n = len(movie_ids)
+        weights = decay ** np.arange(window, dtype=np.float64)
+        keys = np.empty(0, dtype=np.int64)
+        values = np.empty(0, dtype=np.float64)
+        src, dst, w = [], [], []
+
+        def fold():
+            nonlocal keys, values
+            all_keys = np.concatenate([keys, np.concatenate(src) * n + np.concatenate(dst)])
+            all_values = np.concatenate([values, np.concatenate(w)])
+            keys, inverse = np.unique(all_keys, return_inverse=True)
+            values = np.bincount(inverse, weights=all_values)
+            src.clear(), dst.clear(), w.clear()
+
+        pending = 0
+        for sequence in sequences:
+            seq = np.asarray(sequence, dtype=np.int64)
+            for k in range(1, min(window, len(seq) - 1) + 1):
+                src.append(seq[:-k])
+                dst.append(seq[k:])
+                w.append(np.full(len(seq) - k, weights[k - 1]))
+                pending += len(seq) - k
+            if pending >= chunk_pairs:
+                fold()
+                pending = 0
+        if src:
+            fold()
+
+        rows, cols = np.divmod(keys, n)
+        mask = rows != cols
+        rows, cols, values = rows[mask], cols[mask], values[mask]
+
+        # Keep the top_m successors per row: sort by (row, -weight) and cut
+        # each row's run at top_m.
+        order = np.lexsort((-values, rows))
+        rows, cols, values = rows[order], cols[order], values[order]
+        starts = np.searchsorted(rows, rows, side="left")
+        keep = (np.arange(len(rows)) - starts) < top_m
+        rows, cols, values = rows[keep], cols[keep], values[keep]
+
+        totals = np.bincount(rows, weights=values, minlength=n)
+        data = (values / totals[rows]).astype(np.float32)
+        indptr = np.zeros(n + 1, dtype=np.int64)
+        np.cumsum(np.bincount(rows, minlength=n), out=indptr[1:])
+        return cls(np.asarray(movie_ids, dtype=str), indptr, cols.astype(np.int32), data)
+
+    def save(self, path: Path) -> None:
+        save_npz(path, movie_ids=self.movie_ids, indptr=self.indptr, indices=self.indices, data=self.data)
+
+    @classmethod
+    def load(cls, path: Path) -> "TransitionModel":
+        with np.load(path) as arrays:
+            return cls(arrays["movie_ids"], arrays["indptr"], arrays["indices"], arrays["data"])
+
+    def recommend(self, recent: list[str], limit: int = 10, recency_decay: float = 0.7) -> list[tuple[str, float]]:
+        """Score successors of ``recent`` (oldest first) and return the best ``limit`` unseen movies."""
+        seen = [self.index[m] for m in recent if m in self.index]
+        if not seen:
+            return []
+
+        scores = np.zeros(len(self.movie_ids), dtype=np.float32)
+        for age, row in enumerate(reversed(seen)):
+            start, end = self.indptr[row], self.indptr[row + 1]
+            scores[self.indices[start:end]] += recency_decay ** age * self.data[start:end]
+        scores[seen] = 0
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > limit:
+            candidates = candidates[np.argpartition(-scores[candidates], limit)[:limit]]
+        candidates = candidates[np.argsort(-scores[candidates], kind="stable")]
+        return [(str(self.movie_ids[i]), float(scores[i])) for i in candidates]
+
+
+def transition_model_path() -> Path:
+    return Path(settings.CINEMATCH_MODEL_DIR) / "transitions.npz"
+
+
+def load_transition_model() -> Optional[TransitionModel]:
+    path = transition_model_path()
+    return TransitionModel.load(path) if path.exists() else None
+
+
+def warmup_transition_model(model: TransitionModel) -> None:
+    # One throwaway recommendation runs the scoring path before the first request.
+    if len(model.movie_ids):
+        model.recommend([str(model.movie_ids[0])])
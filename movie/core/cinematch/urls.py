@@ -0,0 +1,11 @@
+# apps/cinematch/urls.py
+
+from django.urls import path
+from cinematch.views import AlsoWatchedView, EventIngestView, FeedbackView, NextMovieView
+
+urlpatterns = [
+    path("movies/<uuid:id>/also-watched/", AlsoWatchedView.as_view(), name="movie-also-watched"),
+    path("events/", EventIngestView.as_view(), name="event-ingest"),
+    path("feedback/", FeedbackView.as_view(), name="rail-feedback"),
+    path("recommendations/next/", NextMovieView.as_view(), name="recommendations-next"),
+]
@@ -1,3 +1,69 @@
-from django.shortcuts import render
+# apps/cinematch/views.py
 
-# Create your views here.
+from rest_framework import generics, permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from cinematch.events import record_event, record_feedback
+from cinematch.selectors import get_also_watched, get_movies_in_order
+from cinematch.serializers import (
+    EventSerializer,
+    FeedbackSerializer,
+    MovieAssociationSerializer,
+    ScoredMovieSerializer,
+)
+from cinematch.sessions import recommend_next
+
+class AlsoWatchedView(generics.ListAPIView):
+    serializer_class = MovieAssociationSerializer
+    query_budget = 2
+
+    def get_queryset(self):
+        return get_also_watched(self.kwargs["id"])
+
+class EventIngestView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    # Only the auth lookup: events are buffered, not written per request.
+    query_budget = 1
+
+    def post(self, request, *args, **kwargs):
+        many = isinstance(request.data, list)
+        serializer = EventSerializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        events = serializer.validated_data if many else [serializer.validated_data]
+        for event in events:
+            record_event(
+                user_id=request.user.id,
+                movie_id=event["movie"],
+                event_type=event["event_type"],
+                score=event.get("score"),
+            )
+        return Response({"accepted": len(events)}, status=status.HTTP_202_ACCEPTED)
+
+class FeedbackView(APIView):
+    """Impressions and clicks on recommendation rails, buffered for the bandit."""
+    permission_classes = [permissions.IsAuthenticated]
+    query_budget = 1
+
+    def post(self, request, *args, **kwargs):
+        many = isinstance(request.data, list)
+        serializer = FeedbackSerializer(data=request.data, many=many)
+        serializer.is_valid(raise_exception=True)
+        feedback = serializer.validated_data if many else [serializer.validated_data]
+        for item in feedback:
+            record_feedback(rail=item["rail"], movie_id=item["movie"], kind=item["kind"])
+        return Response({"accepted": len(feedback)}, status=status.HTTP_202_ACCEPTED)
+
+class NextMovieView(APIView):
+    permission_classes = [permissions.IsAuthenticated]
+    # Auth lookup plus one query for the recommended movies; the session
+    # itself comes from the cache.
+    query_budget = 2
+
+    def get(self, request, *args, **kwargs):
+        limit = request.query_params.get("limit", "10")
+        limit = min(int(limit), 50) if limit.isdigit() else 10
+        scores = dict(recommend_next(request.user.id, limit=limit))
+        movies = get_movies_in_order(list(scores))
+        data = [{"movie": movie, "score": scores[str(movie.id)]} for movie in movies]
+        return Response(ScoredMovieSerializer(data, many=True).data)
@@ -8,5 +8,14 @@ class GenderChoices(models.TextChoices):
 class RoleChoices(models.TextChoices):
     USER = "user", "User"
     ADMIN = "admin", "Admin"
- 
- 
\ No newline at end of file
+
+class EventTypeChoices(models.TextChoices):
+    RATING = "rating", "Rating"
+    WATCH = "watch", "Watch"
+
+class FeedbackChoices(models.TextChoices):
+    IMPRESSION = "impression", "Impression"
+    CLICK = "click", "Click"
+
+class RailChoices(models.TextChoices):
+    NEXT = "next", "Next movie"
@@ -0,0 +1,35 @@
+import logging
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+
+from core.base.querycount import QueryBudgetExceeded, QueryRecorder, get_query_budget
+
+logger = logging.getLogger(__name__)
+
+
+class QueryBudgetMiddleware:
+    """
+    Runtime counterpart of ``QueryBudgetTestMixin``: logs a warning (or
+    raises, with ``QUERY_BUDGET_STRICT``) when a request issues more queries
+    than its view's ``query_budget``. Disabled unless ``QUERY_BUDGET_RUNTIME``
+    is set, since recording call sites costs a stack walk per query.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_BUDGET_RUNTIME", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        recorder = QueryRecorder(label=f"{request.method} {request.path}")
+        with recorder as report:
+            response = self.get_response(request)
+
+        match = getattr(request, "resolver_match", None)
+        report.budget = get_query_budget(match.func) if match else None
+        if report.exceeded:
+            if getattr(settings, "QUERY_BUDGET_STRICT", False):
+                raise QueryBudgetExceeded(report.format())
+            logger.warning("Query budget exceeded\n%s", report.format())
+        return response
@@ -0,0 +1,156 @@
+"""Per-view query budgets, checked in tests and optionally at runtime."""
+
+import re
+import sys
+import sysconfig
+from collections import Counter, defaultdict
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Optional
+
+import django
+from django.conf import settings
+from django.db import connections
+from django.urls import resolve
+
+_IN_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+_THIS_FILE = str(Path(__file__).resolve())
+_DJANGO_DIR = str(Path(django.__file__).resolve().parent)
+_STDLIB_DIR = sysconfig.get_paths()["stdlib"]
+# Frames that wrap every query and so say nothing about who issued it.
+_HARNESS_FILES = {_THIS_FILE, str(Path(__file__).resolve().with_name("middleware.py"))}
+
+
+class QueryBudgetExceeded(AssertionError):
+    pass
+
+
+def query_signature(sql: str) -> str:
+    """Collapse ``IN (%s, %s, ...)`` lists so batches of any size share a signature."""
+    return _IN_LIST.sub("(...)", sql)
+
+
+def _is_library_internal(filename: str) -> bool:
+    if filename.startswith(_DJANGO_DIR) or filename in _HARNESS_FILES:
+        return True
+    return filename.startswith(_STDLIB_DIR) and "site-packages" not in filename
+
+
+def _describe(frame) -> str:
+    path = Path(frame.f_code.co_filename)
+    base_dir = Path(settings.BASE_DIR)
+    if path.is_relative_to(base_dir):
+        path = path.relative_to(base_dir)
+    elif "site-packages" in path.parts:
+        path = Path(*path.parts[path.parts.index("site-packages") + 1:])
+    return f"{path}:{frame.f_lineno} in {frame.f_code.co_name}"
+
+
+def _call_site() -> str:
+    """
+    The innermost frame outside Django, followed by the nearest project
+    frame below it when that is a library (DRF fields, serializers, ...).
+    """
+    base_dir = str(settings.BASE_DIR)
+    manage_py = str(Path(base_dir) / "manage.py")
+    frame = sys._getframe(2)
+    while frame is not None and _is_library_internal(frame.f_code.co_filename):
+        frame = frame.f_back
+    if frame is None:
+        return "<unknown>"
+
+    site = _describe(frame)
+    if frame.f_code.co_filename.startswith(base_dir):
+        return site
+    caller = frame.f_back
+    while caller is not None:
+        filename = caller.f_code.co_filename
+        if (
+            filename.startswith(base_dir)
+            and filename not in _HARNESS_FILES
+            and filename != manage_py
+            and "site-packages" not in filename
+        ):
+            return f"{site} (via {_describe(caller)})"
+        caller = caller.f_back
+    return site
+
+
+@dataclass
+class QueryReport:
+    label: str
+    budget: Optional[int] = None
+    queries: list[tuple[str, str]] = field(default_factory=list)
+
+    @property
+    def count(self) -> int:
+        return len(self.queries)
+
+    @property
+    def exceeded(self) -> bool:
+        return self.budget is not None and self.count > self.budget
+
+    @property
+    def duplicates(self) -> dict[str, Counter]:
+        """Signatures issued more than once, mapped to the call sites that issued them."""
+        sites = defaultdict(Counter)
+        for sql, site in self.queries:
+            sites[query_signature(sql)][site] += 1
+        return {sql: counter for sql, counter in sites.items() if sum(counter.values()) > 1}
+
+    def format(self) -> str:
+        lines = [f"{self.label}: {self.count} queries (budget {self.budget})"]
+        for sql, sites in self.duplicates.items():
+            lines.append(f"  {sum(sites.values())}x {sql}")
+            for site, count in sites.most_common():
+                lines.append(f"      {count}x from {site}")
+        return "\n".join(lines)
+
+
+class QueryRecorder:
+    """Context manager recording every query issued on any database connection, with its call site."""
+
+    def __init__(self, label: str = "queries", budget: Optional[int] = None):
+        self.report = QueryReport(label=label, budget=budget)
+        self._stack = ExitStack()
+
+    def __call__(self, execute, sql, params, many, context):
+        self.report.queries.append((sql, _call_site()))
+        return execute(sql, params, many, context)
+
+    def __enter__(self) -> QueryReport:
+        for alias in connections:
+            self._stack.enter_context(connections[alias].execute_wrapper(self))
+        return self.report
+
+    def __exit__(self, *exc_info):
+        self._stack.close()
+
+
+def get_query_budget(view) -> Optional[int]:
+    """Budget declared on a view class, or on the callable returned by ``as_view()``."""
+    view_class = getattr(view, "view_class", None)
+    return getattr(view_class, "query_budget", getattr(view, "query_budget", None))
+
+
+@contextmanager
+def query_budget(budget: int, label: str = "block"):
+    """Fail with ``QueryBudgetExceeded`` if the block issues more than ``budget`` queries."""
+    with QueryRecorder(label=label, budget=budget) as report:
+        yield report
+    if report.exceeded:
+        raise QueryBudgetExceeded(report.format())
+
+
+class QueryBudgetTestMixin:
+    """``TestCase`` mixin that checks a request against its view's declared budget."""
+
+    def assertQueryBudget(self, method: str, path: str, *args, **kwargs):
+        view = resolve(path).func
+        budget = get_query_budget(view)
+        if budget is None:
+            self.fail(f"{path} resolves to a view without a query_budget")
+        with query_budget(budget, label=f"{method.upper()} {path}"):
+            response = getattr(self.client, method)(path, *args, **kwargs)
+        return response
@@ -49,6 +49,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'core.base.middleware.QueryBudgetMiddleware',
     "corsheaders.middleware.CorsMiddleware",
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -93,6 +94,29 @@ DATABASES = {
 }
 
 
+# Cache
+# cinematch keeps session buffers, bandit stats and the bandit's rail lock
+# in the default cache, so it must be shared by every worker process.
+# Production must set REDIS_URL; without it each process falls back to its
+# own LocMemCache, which is only good enough for development and tests.
+
+REDIS_URL = env("REDIS_URL", default=None)
+
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -151,5 +175,28 @@ REST_FRAMEWORK = {
     # ],
 }
 
+# Per-view query budgets (see core/base/querycount.py). Tests always enforce
+# them; at runtime the middleware only records queries when enabled.
+QUERY_BUDGET_RUNTIME = env.bool("QUERY_BUDGET_RUNTIME", default=False)
+QUERY_BUDGET_STRICT = env.bool("QUERY_BUDGET_STRICT", default=False)
+
+# cinematch event micro-batching (see cinematch/events.py). A flush interval
+# of 0 applies every event synchronously.
+CINEMATCH_EVENT_FLUSH_MS = env.int("CINEMATCH_EVENT_FLUSH_MS", default=200)
+CINEMATCH_EVENT_MAX_BATCH = env.int("CINEMATCH_EVENT_MAX_BATCH", default=1000)
+
+# Offline-built recommender artifacts (transition model, ...).
+CINEMATCH_MODEL_DIR = env("CINEMATCH_MODEL_DIR", default=os.path.join(BASE_DIR, "artifacts"))
+# Load registered recommender resources when the WSGI app is imported
+# instead of lazily on first use (see cinematch/registry.py).
+CINEMATCH_PRELOAD_RESOURCES = env.bool("CINEMATCH_PRELOAD_RESOURCES", default=False)
+# Per-user recent-interaction buffer used for session recommendations.
+CINEMATCH_SESSION_LENGTH = env.int("CINEMATCH_SESSION_LENGTH", default=20)
+CINEMATCH_SESSION_TTL = env.int("CINEMATCH_SESSION_TTL", default=60 * 60)
+# Exploration on recommendation rails (see cinematch/bandit.py).
+CINEMATCH_BANDIT_HALF_LIFE = env.int("CINEMATCH_BANDIT_HALF_LIFE", default=60 * 60)
+CINEMATCH_BANDIT_REFRESH = env.float("CINEMATCH_BANDIT_REFRESH", default=5.0)
+CINEMATCH_BANDIT_PRIOR_WEIGHT = env.float("CINEMATCH_BANDIT_PRIOR_WEIGHT", default=2.0)
+CINEMATCH_BANDIT_MAX_ARMS = env.int("CINEMATCH_BANDIT_MAX_ARMS", default=10_000)
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
@@ -21,6 +21,6 @@ urlpatterns = [
     path('admin/', admin.site.urls),
     path("api/users/", include("users.urls")),
     path("api/authentication/", include("authentication.urls")),
-    # path("api/apps/cinematch/", include("cinematch.urls")),
+    path("api/apps/cinematch/", include("cinematch.urls")),
 
 ]
@@ -14,3 +14,13 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
 
 application = get_wsgi_application()
+
+# Load recommender resources before the server forks its workers (see
+# gunicorn.conf.py), so they are shared copy-on-write instead of loaded
+# once per worker on the first request.
+from django.conf import settings  # noqa: E402
+
+if settings.CINEMATCH_PRELOAD_RESOURCES:
+    from cinematch.registry import preload
+
+    preload()
@@ -0,0 +1,11 @@
+# gunicorn.conf.py
+#
+# Import the WSGI app in the master before forking, so resources loaded by
+# core/wsgi.py are shared copy-on-write by every worker. Whether anything
+# is preloaded is up to the environment (CINEMATCH_PRELOAD_RESOURCES).
+import multiprocessing
+import os
+
+wsgi_app = "core.wsgi:application"
+preload_app = True
+workers = int(os.environ.get("WEB_CONCURRENCY", multiprocessing.cpu_count() * 2 + 1))
@@ -1,4 +1,36 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from core.base.choices import RoleChoices
 from users.models import CustomUser
+from users.services import bulk_activate_users, bulk_deactivate_users, bulk_set_role
 # Register your models here.
-admin.site.register(CustomUser)
\ No newline at end of file
+
+@admin.register(CustomUser)
+class CustomUserAdmin(admin.ModelAdmin):
+    list_display = ["email", "username", "role", "is_active", "date_joined"]
+    list_filter = ["role", "is_active"]
+    search_fields = ["email", "username"]
+    actions = ["deactivate_users", "activate_users", "make_admin", "make_user"]
+
+    def _run(self, request, queryset, service, *args):
+        # Admins cannot deactivate or demote themselves.
+        if queryset.filter(pk=request.user.pk).exists():
+            self.message_user(request, "Your own account was left unchanged.", messages.WARNING)
+        ids = queryset.exclude(pk=request.user.pk).values_list("id", flat=True)
+        updated = service(ids.iterator(), *args)
+        self.message_user(request, f"Updated {updated} users.")
+
+    @admin.action(description="Deactivate selected users")
+    def deactivate_users(self, request, queryset):
+        self._run(request, queryset, bulk_deactivate_users)
+
+    @admin.action(description="Activate selected users")
+    def activate_users(self, request, queryset):
+        self._run(request, queryset, bulk_activate_users)
+
+    @admin.action(description="Set role to admin")
+    def make_admin(self, request, queryset):
+        self._run(request, queryset, bulk_set_role, RoleChoices.ADMIN)
+
+    @admin.action(description="Set role to user")
+    def make_user(self, request, queryset):
+        self._run(request, queryset, bulk_set_role, RoleChoices.USER)
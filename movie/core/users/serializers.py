@@ -1,4 +1,5 @@
 from rest_framework import serializers
+from core.base.choices import RoleChoices
 from users.models import CustomUser
 
 class UserSerializer(serializers.ModelSerializer):
@@ -14,4 +15,20 @@ class UserDetailSerializer(serializers.ModelSerializer):
 class UserUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = CustomUser
-        fields = ["first_name", "last_name", "favorite_genres", "gender"]
+        fields = ["username"]
+
+class BulkUserActionSerializer(serializers.Serializer):
+    ACTIONS = ["activate", "deactivate", "set_role"]
+
+    ids = serializers.ListField(
+        child=serializers.UUIDField(),
+        allow_empty=False,
+        max_length=5000,
+    )
+    action = serializers.ChoiceField(choices=ACTIONS)
+    role = serializers.ChoiceField(choices=RoleChoices.choices, required=False)
+
+    def validate(self, attrs):
+        if attrs["action"] == "set_role" and not attrs.get("role"):
+            raise serializers.ValidationError({"role": "This field is required for set_role."})
+        return attrs
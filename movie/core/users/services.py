@@ -1,8 +1,13 @@
 # apps/users/services.py
 
-from users.models import CustomUser
+from itertools import islice
+from typing import Iterable
+
+from django.db import transaction
 from django.utils import timezone
-from typing import Optional
+
+from core.base.choices import RoleChoices
+from users.models import CustomUser
 
 def create_user(email: str, username: str, password: str, **extra_fields) -> CustomUser:
     user = CustomUser.objects.create_user(
@@ -14,12 +19,41 @@ def create_user(email: str, username: str, password: str, **extra_fields) -> Cus
     return user
 
 def update_user_profile(user: CustomUser, data: dict) -> CustomUser:
+    changed = []
     for attr, value in data.items():
-        setattr(user, attr, value)
-    user.save()
+        if getattr(user, attr) != value:
+            setattr(user, attr, value)
+            changed.append(attr)
+    if changed:
+        user.save(update_fields=[*changed, "updated_at"])
     return user
 
 def deactivate_user(user: CustomUser) -> CustomUser:
-    user.is_active = False
-    user.save()
-    return user
+    return update_user_profile(user, {"is_active": False})
+
+def bulk_update_users(user_ids: Iterable, fields: dict, chunk_size: int = 1000) -> int:
+    """
+    Apply ``fields`` to every user in ``user_ids`` with one ``UPDATE`` per
+    chunk instead of a save per row, all in one transaction so a failure
+    leaves no chunk applied. Returns the number of rows updated.
+    """
+    ids = iter(user_ids)
+    updated = 0
+    with transaction.atomic():
+        while chunk := list(islice(ids, chunk_size)):
+            updated += CustomUser.objects.filter(id__in=chunk).update(**fields, updated_at=timezone.now())
+    return updated
+
+def bulk_deactivate_users(user_ids: Iterable, chunk_size: int = 1000) -> int:
+    return bulk_update_users(user_ids, {"is_active": False}, chunk_size)
+
+def bulk_activate_users(user_ids: Iterable, chunk_size: int = 1000) -> int:
+    return bulk_update_users(user_ids, {"is_active": True}, chunk_size)
+
+def bulk_set_role(user_ids: Iterable, role: str, chunk_size: int = 1000) -> int:
+    # Admin access is checked through is_staff, so it follows the role; a
+    # demoted superuser would otherwise keep every permission.
+    fields = {"role": role, "is_staff": role == RoleChoices.ADMIN}
+    if role != RoleChoices.ADMIN:
+        fields["is_superuser"] = False
+    return bulk_update_users(user_ids, fields, chunk_size)
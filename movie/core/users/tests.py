@@ -1,3 +1,208 @@
+from unittest import mock
+
+from django.db import DatabaseError, connection
+from django.db.models import QuerySet
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver, reverse
+
+from authentication.utils import get_tokens
+from core.base.choices import RoleChoices
+from core.base.querycount import (
+    QueryBudgetExceeded,
+    QueryBudgetTestMixin,
+    QueryRecorder,
+    get_query_budget,
+    query_budget,
+)
+from users.models import CustomUser
+from users.services import bulk_deactivate_users, update_user_profile
+
+
+def bearer(user):
+    return {"HTTP_AUTHORIZATION": f"Bearer {get_tokens(user)[0]}"}
+
+
+class UserEndpointQueryBudgetTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser(
+            email="admin@example.com", username="admin", password="password123"
+        )
+        cls.user = CustomUser.objects.create_user(
+            email="viewer@example.com", username="viewer", password="password123"
+        )
+        for i in range(5):
+            CustomUser.objects.create_user(
+                email=f"user{i}@example.com", username=f"user{i}", password="password123"
+            )
+
+    def test_user_list(self):
+        response = self.assertQueryBudget("get", reverse("user-list"), **bearer(self.admin))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 7)
+
+    def test_user_detail(self):
+        path = reverse("user-detail", kwargs={"id": self.user.id})
+        response = self.assertQueryBudget("get", path, **bearer(self.user))
+        self.assertEqual(response.status_code, 200)
+
+    def test_user_update(self):
+        response = self.assertQueryBudget(
+            "patch",
+            reverse("user-update"),
+            {"username": "renamed"},
+            content_type="application/json",
+            **bearer(self.user),
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["username"], "renamed")
+
+
+class QueryBudgetTests(TestCase):
+    def test_reports_duplicate_call_site(self):
+        with self.assertRaises(QueryBudgetExceeded) as ctx:
+            with query_budget(1, label="loop"):
+                for _ in range(3):
+                    CustomUser.objects.filter(email="nobody@example.com").first()
+
+        message = str(ctx.exception)
+        self.assertIn("loop: 3 queries (budget 1)", message)
+        self.assertIn("3x from users/tests.py", message)
+
+    def test_attributes_library_queries_to_the_issuing_frame(self):
+        user = CustomUser.objects.create_user(email="viewer@example.com", username="viewer")
+        with QueryRecorder() as report:
+            self.client.get(reverse("user-detail", kwargs={"id": user.id}), **bearer(user))
+
+        sites = [site for sql, site in report.queries if "auth_group" in sql]
+        self.assertEqual(len(sites), 1)
+        self.assertTrue(sites[0].startswith("rest_framework/relations.py:"), sites[0])
+        self.assertIn("(via users/tests.py:", sites[0])
+
+    def test_every_endpoint_declares_a_budget(self):
+        def walk(patterns, prefix=""):
+            for pattern in patterns:
+                if isinstance(pattern, URLResolver):
+                    if pattern.app_name != "admin":
+                        yield from walk(pattern.url_patterns, prefix + str(pattern.pattern))
+                elif isinstance(pattern, URLPattern):
+                    yield prefix + str(pattern.pattern), pattern.callback
+
+        missing = [route for route, view in walk(get_resolver().url_patterns) if get_query_budget(view) is None]
+        self.assertEqual(missing, [])
+
+
+class BulkUserActionTests(QueryBudgetTestMixin, TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = CustomUser.objects.create_superuser(
+            email="admin@example.com", username="admin", password="password123"
+        )
+        cls.users = [
+            CustomUser.objects.create_user(
+                email=f"user{i}@example.com", username=f"user{i}", password="password123"
+            )
+            for i in range(5)
+        ]
+
+    def post(self, payload):
+        return self.assertQueryBudget(
+            "post",
+            reverse("user-bulk-action"),
+            payload,
+            content_type="application/json",
+            **bearer(self.admin),
+        )
+
+    def test_deactivate(self):
+        ids = [str(user.id) for user in self.users]
+        response = self.post({"ids": ids, "action": "deactivate"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {"updated": 5})
+        self.assertFalse(CustomUser.objects.filter(id__in=ids, is_active=True).exists())
+
+    def test_set_role_requires_role(self):
+        response = self.post({"ids": [str(self.users[0].id)], "action": "set_role"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_set_role_syncs_staff_flag(self):
+        self.post({"ids": [str(self.users[0].id)], "action": "set_role", "role": RoleChoices.ADMIN})
+        self.users[0].refresh_from_db()
+        self.assertEqual(self.users[0].role, RoleChoices.ADMIN)
+        self.assertTrue(self.users[0].is_staff)
+
+    def test_demoting_clears_superuser(self):
+        other = CustomUser.objects.create_superuser(
+            email="other@example.com", username="other", password="password123"
+        )
+        self.post({"ids": [str(other.id)], "action": "set_role", "role": RoleChoices.USER})
+        other.refresh_from_db()
+        self.assertEqual((other.role, other.is_staff, other.is_superuser), (RoleChoices.USER, False, False))
+
+    def test_admin_cannot_act_on_themselves(self):
+        ids = [str(self.admin.id), str(self.users[0].id)]
+        response = self.post({"ids": ids, "action": "deactivate"})
+        self.assertEqual(response.json(), {"updated": 1})
+        self.admin.refresh_from_db()
+        self.assertTrue(self.admin.is_active)
+
+    def test_admin_action_skips_own_account(self):
+        self.client.force_login(self.admin)
+        response = self.client.post(
+            reverse("admin:users_customuser_changelist"),
+            {"action": "deactivate_users", "_selected_action": [self.admin.pk, self.users[0].pk]},
+            follow=True,
+        )
+        self.assertContains(response, "Your own account was left unchanged.")
+        self.admin.refresh_from_db()
+        self.users[0].refresh_from_db()
+        self.assertTrue(self.admin.is_active)
+        self.assertFalse(self.users[0].is_active)
+
+    def test_failed_chunk_rolls_back_earlier_chunks(self):
+        ids = [user.id for user in self.users]
+        update = QuerySet.update
+        calls = []
+
+        def failing_update(queryset, **kwargs):
+            calls.append(1)
+            if len(calls) == 2:
+                raise DatabaseError("boom")
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, "update", failing_update), self.assertRaises(DatabaseError):
+            bulk_deactivate_users(ids, chunk_size=2)
+        self.assertEqual(CustomUser.objects.filter(id__in=ids, is_active=True).count(), 5)
+
+    def test_chunks_updates(self):
+        ids = [user.id for user in self.users]
+        with CaptureQueriesContext(connection) as ctx:
+            self.assertEqual(bulk_deactivate_users(ids, chunk_size=2), 5)
+        updates = [q for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        self.assertEqual(len(updates), 3)
+
+    def test_deactivated_user_is_rejected(self):
+        user = self.users[0]
+        path = reverse("user-detail", kwargs={"id": user.id})
+        headers = bearer(user)
+        self.assertEqual(self.client.get(path, **headers).status_code, 200)
+        bulk_deactivate_users([user.id])
+        self.assertEqual(self.client.get(path, **headers).status_code, 403)
+
+
+class UpdateUserProfileTests(TestCase):
+    def test_writes_only_changed_fields(self):
+        user = CustomUser.objects.create_user(
+            email="viewer@example.com", username="viewer", password="password123"
+        )
+        with CaptureQueriesContext(connection) as ctx:
+            update_user_profile(user, {"username": "renamed", "email": user.email})
+        self.assertEqual(len(ctx.captured_queries), 1)
+        sql = ctx.captured_queries[0]["sql"]
+        self.assertIn('"username"', sql)
+        self.assertNotIn('"email"', sql)
 
-# Create your tests here.
+        with CaptureQueriesContext(connection) as ctx:
+            update_user_profile(user, {"username": "renamed"})
+        self.assertEqual(ctx.captured_queries, [])
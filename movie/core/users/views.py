@@ -1,13 +1,19 @@
 # apps/users/views.py
 
-from rest_framework import generics, permissions
+from rest_framework import generics, permissions, status
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
 from users.models import CustomUser
 from users.selectors import get_user_by_id, get_all_users
-from users.services import update_user_profile
+from users.services import (
+    bulk_activate_users,
+    bulk_deactivate_users,
+    bulk_set_role,
+    update_user_profile,
+)
 from users.serializers import (
+    BulkUserActionSerializer,
     UserSerializer,
     UserDetailSerializer,
     UserUpdateSerializer,
@@ -17,19 +23,45 @@ class UserListView(generics.ListAPIView):
     queryset = get_all_users()
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
+    query_budget = 2
 
 class UserDetailView(generics.RetrieveAPIView):
     queryset = CustomUser.objects.all()
     serializer_class = UserDetailSerializer
     permission_classes = [permissions.IsAuthenticated]
     lookup_field = "id"
+    # Auth lookup, the user row, then one query each for the `groups` and
+    # `user_permissions` M2Ms that `fields = "__all__"` pulls in.
+    query_budget = 4
 
 class UserUpdateView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    query_budget = 5
 
     def patch(self, request, *args, **kwargs):
         user = request.user
         serializer = UserUpdateSerializer(user, data=request.data, partial=True)
         serializer.is_valid(raise_exception=True)
-        serializer.save()
+        update_user_profile(user, serializer.validated_data)
         return Response(UserDetailSerializer(user).data)
+
+class BulkUserActionView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+    # Auth lookup plus one UPDATE per 1000-id chunk (at most 5000 ids).
+    query_budget = 6
+
+    def post(self, request, *args, **kwargs):
+        serializer = BulkUserActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        # Admins cannot deactivate or demote themselves.
+        ids = [user_id for user_id in serializer.validated_data["ids"] if user_id != request.user.id]
+        action = serializer.validated_data["action"]
+
+        if action == "activate":
+            updated = bulk_activate_users(ids)
+        elif action == "deactivate":
+            updated = bulk_deactivate_users(ids)
+        else:
+            updated = bulk_set_role(ids, serializer.validated_data["role"])
+
+        return Response({"updated": updated}, status=status.HTTP_200_OK)